@@ -17,6 +17,7 @@ conditioning (HVAC).
 from typing import List
 
 import numpy as np
+from numba import njit
 
 
 __version__ = "1.1.0"
@@ -24,6 +25,44 @@ __version__ = "1.1.0"
 from src.time_intervals import get_number_of_time_intervals_per_day
 
 
+@njit(cache=True)
+def _get_charging_efficiency_index(active_power_in_kilowatts, absolute_active_power_in_kilowatts):
+    """
+    Index of the charging efficiency table for the percentage of the absolute power, kept within the 100 entries of
+    the table (an idle interval reads the first entry and a power above the absolute power reads the last one)
+    """
+    P_ratio = int(100 * (abs(active_power_in_kilowatts / absolute_active_power_in_kilowatts)))
+    return min(100, max(1, P_ratio)) - 1
+
+
+@njit(cache=True)
+def _update_storage_asset_energy_level(active_power_in_kilowatts, energy_level_in_kilowatt_hour,
+                                       min_energy_in_kilowatt_hour, max_energy_in_kilowatt_hour,
+                                       charging_energy_per_kilowatt, discharging_energy_per_kilowatt,
+                                       absolute_active_power_in_kilowatts, number_of_time_intervals):
+    """
+    Roll out the storage energy level over the time series in place, stopping the charge (discharge) of every time
+    interval that starts at (or above) the maximum (at or below the minimum) energy. The energy limits are given
+    per simulation time interval and the (dis)charging energy per kilowatt tables already include the interval
+    duration
+    """
+    for t in range(number_of_time_intervals):
+        efficiency_index = _get_charging_efficiency_index(active_power_in_kilowatts[t],
+                                                          absolute_active_power_in_kilowatts)
+        if active_power_in_kilowatts[t] < 0:
+            if energy_level_in_kilowatt_hour[t] <= min_energy_in_kilowatt_hour[t]:
+                energy_level_in_kilowatt_hour[t] = min_energy_in_kilowatt_hour[t]
+                active_power_in_kilowatts[t] = 0
+            energy_level_in_kilowatt_hour[t + 1] = energy_level_in_kilowatt_hour[t] + \
+                discharging_energy_per_kilowatt[efficiency_index] * active_power_in_kilowatts[t]
+        elif active_power_in_kilowatts[t] >= 0:
+            if energy_level_in_kilowatt_hour[t] >= max_energy_in_kilowatt_hour[t]:
+                energy_level_in_kilowatt_hour[t] = max_energy_in_kilowatt_hour[t]
+                active_power_in_kilowatts[t] = 0
+            energy_level_in_kilowatt_hour[t + 1] = energy_level_in_kilowatt_hour[t] + \
+                charging_energy_per_kilowatt[efficiency_index] * active_power_in_kilowatts[t]
+
+
 class Asset:
     """ An energy resource located at a particular bus in the network """
     def __init__(self,
@@ -59,8 +98,6 @@ class BuildingAsset(Asset):
         Asset.__init__(self,
                        bus_id=bus_id,
                        simulation_time_series_hour_resolution=simulation_time_series_hour_resolution)
-        self.max_inside_degree_celsius = max_inside_degree_celsius
-        self.min_inside_degree_celsius = min_inside_degree_celsius
         self.max_consumed_electric_heating_kilowatts = max_consumed_electric_heating_kilowatts
         self.max_consumed_electric_cooling_kilowatts = max_consumed_electric_cooling_kilowatts
         self.energy_management_system_time_series_hour_resolution = \
@@ -72,11 +109,8 @@ class BuildingAsset(Asset):
             building_thermal_resistance_in_degree_celsius_per_kilowatts
         self.heat_pump_coefficient_of_performance = heat_pump_coefficient_of_performance
         self.chiller_coefficient_of_performance = chiller_coefficient_of_performance
-        self.energy_management_system_time_series_hour_resolution = \
-            energy_management_system_time_series_resolution_in_hours
-        self.number_of_energy_management_system_time_intervals_per_day = \
-            int(24 / self.energy_management_system_time_series_hour_resolution)
-        self.number_of_time_intervals_per_day = int(24 / self.simulation_time_series_hour_resolution)
+        self.number_of_energy_management_system_time_intervals_per_day = get_number_of_time_intervals_per_day(
+            time_series_resolution_in_hours=self.energy_management_system_time_series_hour_resolution)
         self.alpha = (1 - (energy_management_system_time_series_resolution_in_hours /
                            (building_thermal_resistance_in_degree_celsius_per_kilowatts *
                             building_thermal_capacitance_in_kilowatts_hour_per_degree_celsius)))
@@ -87,12 +121,14 @@ class BuildingAsset(Asset):
                       building_thermal_capacitance_in_kilowatts_hour_per_degree_celsius)
         self.active_power_in_kilowatts = np.zeros(self.number_of_time_intervals_per_day)   # input powers over the time series (kW)
         self.reactive_power = np.zeros(self.number_of_time_intervals_per_day)   # reactive powers over the time series (kW)
-        self.max_inside_degree_celsius = max_inside_degree_celsius * np.ones(
-            self.number_of_energy_management_system_time_intervals_per_day)
-        self.min_inside_degree_celsius = min_inside_degree_celsius * np.ones(
-            self.number_of_energy_management_system_time_intervals_per_day)
-        self.ambient_temperature_in_degree_celsius = ambient_temperature_in_degree_celsius * np.ones(
-            self.number_of_energy_management_system_time_intervals_per_day)  # TODO adapt the code to be able to handle cases from UK and Pamplona
+        self.max_inside_degree_celsius = np.full(self.number_of_energy_management_system_time_intervals_per_day,
+                                                 max_inside_degree_celsius, dtype=float)
+        self.min_inside_degree_celsius = np.full(self.number_of_energy_management_system_time_intervals_per_day,
+                                                 min_inside_degree_celsius, dtype=float)
+        # the ambient temperature is either a constant or already one value per energy management time interval
+        self.ambient_temperature_in_degree_celsius = np.broadcast_to(
+            ambient_temperature_in_degree_celsius,
+            self.number_of_energy_management_system_time_intervals_per_day).astype(float)  # TODO adapt the code to be able to handle cases from UK and Pamplona
 
     def update_control(self, active_power):
         """
@@ -138,7 +174,7 @@ class StorageAsset(Asset):
         self.initial_energy_level_in_kilowatt_hour = initial_energy_level_in_kilowatt_hour
         self.required_terminal_energy_level_in_kilowatt_hour = required_terminal_energy_level_in_kilowatt_hour
         self.energy_level_in_kilowatt_hour = \
-            initial_energy_level_in_kilowatt_hour * np.ones(number_of_time_intervals_per_day + 1)
+            np.full(number_of_time_intervals_per_day + 1, initial_energy_level_in_kilowatt_hour, dtype=float)
         self.energy_management_system_time_series_resolution_in_seconds = \
             energy_management_system_time_series_resolution_in_seconds
         self.number_of_energy_management_system_time_intervals_per_day = \
@@ -147,8 +183,13 @@ class StorageAsset(Asset):
         self.reactive_power_in_kilovolt_ampere_reactive = np.zeros(number_of_time_intervals_per_day)
         self.battery_degradation_ratio_in_euros_per_kilowatt_hour = \
             battery_degradation_ratio_in_euros_per_kilowatt_hour or 0
-        self.charging_efficiency = charging_efficiency * np.ones(100)
+        self.charging_efficiency = np.full(100, charging_efficiency, dtype=float)
         self.charging_efficiency_for_the_optimizer = charging_efficiency_for_the_optimizer
+        # energy management system time interval of every simulation time interval
+        energy_management_system_time = self.simulation_time_series_hour_resolution / \
+            self.energy_management_system_time_series_resolution_in_seconds
+        self.energy_management_system_time_intervals = \
+            (np.arange(self.number_of_time_intervals_per_day) * energy_management_system_time).astype(int)
 
     def update_control(self, active_power_in_kilowatts):
         """
@@ -161,22 +202,25 @@ class StorageAsset(Asset):
 
         """
         self.active_power_in_kilowatts = active_power_in_kilowatts
-        self.energy_level_in_kilowatt_hour[0] = self.initial_energy_level_in_kilowatt_hour
-        energy_management_system_time = self.simulation_time_series_hour_resolution / self.energy_management_system_time_series_resolution_in_seconds
-        for t in range(self.number_of_time_intervals_per_day):
-            P_ratio = int(100 * (abs(self.active_power_in_kilowatts[t] / self.absolute_active_power_in_kilowatts)))
-            P_eff = self.charging_efficiency[P_ratio-1]
-            t_energy_management_system = int(t * energy_management_system_time)
-            if self.active_power_in_kilowatts[t] < 0:
-                if self.energy_level_in_kilowatt_hour[t] <= self.min_energy_in_kilowatt_hour[t_energy_management_system]:
-                    self.energy_level_in_kilowatt_hour[t] = self.min_energy_in_kilowatt_hour[t_energy_management_system]
-                    self.active_power_in_kilowatts[t] = 0
-                self.energy_level_in_kilowatt_hour[t + 1] = self.energy_level_in_kilowatt_hour[t] + (1 / P_eff) * self.active_power_in_kilowatts[t] * self.simulation_time_series_hour_resolution
-            elif self.active_power_in_kilowatts[t] >= 0:
-                if self.energy_level_in_kilowatt_hour[t] >= self.max_energy_in_kilowatt_hour[t_energy_management_system]:
-                    self.energy_level_in_kilowatt_hour[t] = self.max_energy_in_kilowatt_hour[t_energy_management_system]
-                    self.active_power_in_kilowatts[t] = 0
-                self.energy_level_in_kilowatt_hour[t + 1] = self.energy_level_in_kilowatt_hour[t] + P_eff * self.active_power_in_kilowatts[t] * self.simulation_time_series_hour_resolution
+        self._update_energy_level(start_time_interval=0, stop_time_interval=self.number_of_time_intervals_per_day)
+
+    def update_control_range(self, active_power_in_kilowatts, start_time_interval, stop_time_interval):
+        """
+        Update the storage system power and energy over the time intervals from start_time_interval (included) to
+        stop_time_interval (excluded)
+
+        Parameters
+        ----------
+        active_power_in_kilowatts : numpy.ndarray
+            input powers over the time intervals (kW)
+        start_time_interval : int
+            first time interval
+        stop_time_interval : int
+            time interval after the last one
+
+        """
+        self.active_power_in_kilowatts[start_time_interval:stop_time_interval] = active_power_in_kilowatts
+        self._update_energy_level(start_time_interval=start_time_interval, stop_time_interval=stop_time_interval)
 # NEEDED FOR OXEMF EV CASE
     def update_control_t(self, Pnet_t, t):
         """
@@ -190,21 +234,26 @@ class StorageAsset(Asset):
             time interval
 
         """
-        self.active_power_in_kilowatts[t] = Pnet_t
-        self.energy_level_in_kilowatt_hour[0] = self.initial_energy_level_in_kilowatt_hour
-        t_ems = self.simulation_time_series_hour_resolution / self.energy_management_system_time_series_resolution_in_seconds
-        P_ratio = int(100 * (abs(self.active_power_in_kilowatts[t] / self.absolute_active_power_in_kilowatts)))
-        P_eff = self.eff[P_ratio-1]
-        if self.active_power_in_kilowatts[t] < 0:
-            if self.energy_level_in_kilowatt_hour[t] <= self.min_energy_in_kilowatt_hour[int(t * t_ems)]:
-                self.energy_level_in_kilowatt_hour[t] = self.min_energy_in_kilowatt_hour[int(t * t_ems)]
-                self.active_power_in_kilowatts[t] = 0
-            self.energy_level_in_kilowatt_hour[t + 1] = self.energy_level_in_kilowatt_hour[t] + (1 / P_eff) * self.active_power_in_kilowatts[t] * self.simulation_time_series_hour_resolution
-        elif self.active_power_in_kilowatts[t] >= 0:
-            if self.energy_level_in_kilowatt_hour[t] >= self.max_energy_in_kilowatt_hour[int(t * t_ems)]:
-                self.energy_level_in_kilowatt_hour[t] = self.max_energy_in_kilowatt_hour[int(t * t_ems)]
-                self.active_power_in_kilowatts[t] = 0
-            self.energy_level_in_kilowatt_hour[t + 1] = self.energy_level_in_kilowatt_hour[t] + P_eff * self.active_power_in_kilowatts[t] * self.simulation_time_series_hour_resolution
+        self.update_control_range(active_power_in_kilowatts=Pnet_t, start_time_interval=t, stop_time_interval=t + 1)
+
+    def _update_energy_level(self, start_time_interval, stop_time_interval):
+        # the energy level is only reset when the update starts at the beginning of the time series
+        if start_time_interval == 0:
+            self.energy_level_in_kilowatt_hour[0] = self.initial_energy_level_in_kilowatt_hour
+        energy_management_system_time_intervals = \
+            self.energy_management_system_time_intervals[start_time_interval:stop_time_interval]
+        _update_storage_asset_energy_level(
+            active_power_in_kilowatts=self.active_power_in_kilowatts[start_time_interval:stop_time_interval],
+            energy_level_in_kilowatt_hour=
+            self.energy_level_in_kilowatt_hour[start_time_interval:stop_time_interval + 1],
+            min_energy_in_kilowatt_hour=np.asarray(
+                self.min_energy_in_kilowatt_hour, dtype=float)[energy_management_system_time_intervals],
+            max_energy_in_kilowatt_hour=np.asarray(
+                self.max_energy_in_kilowatt_hour, dtype=float)[energy_management_system_time_intervals],
+            charging_energy_per_kilowatt=self.charging_efficiency * self.simulation_time_series_hour_resolution,
+            discharging_energy_per_kilowatt=self.simulation_time_series_hour_resolution / self.charging_efficiency,
+            absolute_active_power_in_kilowatts=float(self.absolute_active_power_in_kilowatts),
+            number_of_time_intervals=stop_time_interval - start_time_interval)
 
 
 class NonDispatchableAsset(Asset):
@@ -220,8 +269,6 @@ class NonDispatchableAsset(Asset):
                  active_power_pred=None,
                  reactive_power_pred=None):
 
-        self.simulation_time_series_hour_resolution = simulation_time_series_hour_resolution
-
         Asset.__init__(self,
                        bus_id=bus_id,
                        simulation_time_series_hour_resolution=simulation_time_series_hour_resolution,
@@ -230,22 +277,10 @@ class NonDispatchableAsset(Asset):
         self.active_power_in_kilowatts = active_power_in_kilowatts
         self.reactive_power = reactive_power_in_kilovolt_ampere_reactive
 
-        self.active_power_pred = self._get_active_power_pred(active_power_pred=active_power_pred)
-        self.reactive_power_pred = self._get_reactive_power_pred(reactive_power_pred=reactive_power_pred)
-
-    def _get_active_power_pred(self, active_power_pred):
-        if active_power_pred is not None:
-            self.active_power_pred = active_power_pred
-        else:
-            self.active_power_pred = self.active_power_in_kilowatts
-        return self.active_power_pred
-
-    def _get_reactive_power_pred(self, reactive_power_pred):
-        if reactive_power_pred is not None:
-            self.reactive_power_pred = reactive_power_pred
-        else:
-            self.reactive_power_pred = self.reactive_power
-        return self.reactive_power_pred
+        # without a forecast the asset is predicted to follow its actual power
+        self.active_power_pred = \
+            active_power_pred if active_power_pred is not None else self.active_power_in_kilowatts
+        self.reactive_power_pred = reactive_power_pred if reactive_power_pred is not None else self.reactive_power
 
 # =============================================================================
 # Below 3ph assets to be removed in V 0.1.0
@@ -280,8 +315,8 @@ class Asset_3ph(Asset):
     def __init__(self, bus_id, phases, simulation_time_series_hour_resolution):
         Asset.__init__(self,
                        bus_id=bus_id,
-                       simulation_time_series_hour_resolution=simulation_time_series_hour_resolution)
-        self.phases = np.array(phases)
+                       simulation_time_series_hour_resolution=simulation_time_series_hour_resolution,
+                       phases=phases)
 
 
 class StorageAsset_3ph(Asset_3ph):
@@ -341,8 +376,6 @@ class StorageAsset_3ph(Asset_3ph):
                  dt_ems, T_ems, Pmax_abs=None, c_deg_lin=None, eff=1,
                  eff_opt=1):
         Asset_3ph.__init__(self, bus_id, phases, simulation_time_series_hour_resolution)
-        self.number_of_time_intervals_per_day = get_number_of_time_intervals_per_day(
-            time_series_resolution_in_hours=self.simulation_time_series_hour_resolution)
         self.Emax = Emax
         self.Emin = Emin
         self.Pmax = Pmax
@@ -353,14 +386,17 @@ class StorageAsset_3ph(Asset_3ph):
             self.Pmax_abs = Pmax_abs
         self.E0 = E0
         self.ET = ET
-        self.E = E0*np.ones(self.number_of_time_intervals_per_day + 1)
+        self.E = np.full(self.number_of_time_intervals_per_day + 1, E0, dtype=float)
         self.dt_ems = dt_ems
         self.T_ems = T_ems
         self.Pnet = np.zeros(self.number_of_time_intervals_per_day)
         self.Qnet = np.zeros(self.number_of_time_intervals_per_day)
         self.c_deg_lin = c_deg_lin or 0
-        self.eff = eff*np.ones(100)
+        self.eff = np.full(100, eff, dtype=float)
         self.eff_opt = eff_opt
+        # energy management system time interval of every simulation time interval
+        self.t_ems_index = (np.arange(self.number_of_time_intervals_per_day) *
+                            (self.simulation_time_series_hour_resolution / self.dt_ems)).astype(int)
 
     def update_control(self, Pnet):
         """
@@ -374,20 +410,17 @@ class StorageAsset_3ph(Asset_3ph):
         """
         self.Pnet = Pnet
         self.E[0] = self.E0
-        t_ems = self.simulation_time_series_hour_resolution / self.dt_ems
-        for t in range(self.number_of_time_intervals_per_day):
-            P_ratio = int(100*(abs(self.Pnet[t]/self.Pmax_abs)))
-            P_eff = self.eff[P_ratio-1]
-            if self.Pnet[t] < 0:
-                if self.E[t] <= self.Emin[int(t*t_ems)]:
-                    self.E[t] = self.Emin[int(t*t_ems)]
-                    self.Pnet[t] = 0
-                self.E[t+1] = self.E[t] + (1/P_eff)*self.Pnet[t]*self.simulation_time_series_hour_resolution
-            elif self.Pnet[t] >= 0:
-                if self.E[t] >= self.Emax[t]:
-                    self.E[t] = self.Emax[t]
-                    self.Pnet[t] = 0
-                self.E[t+1] = self.E[t] + P_eff*self.Pnet[t]*self.simulation_time_series_hour_resolution
+        T_range = np.arange(self.number_of_time_intervals_per_day)
+        # the minimum energy is read at the energy management system time interval, the maximum energy at the
+        # simulation time interval
+        _update_storage_asset_energy_level(
+            active_power_in_kilowatts=self.Pnet, energy_level_in_kilowatt_hour=self.E,
+            min_energy_in_kilowatt_hour=np.asarray(self.Emin, dtype=float)[self.t_ems_index],
+            max_energy_in_kilowatt_hour=np.asarray(self.Emax, dtype=float)[T_range],
+            charging_energy_per_kilowatt=self.eff * self.simulation_time_series_hour_resolution,
+            discharging_energy_per_kilowatt=self.simulation_time_series_hour_resolution / self.eff,
+            absolute_active_power_in_kilowatts=float(self.Pmax_abs),
+            number_of_time_intervals=self.number_of_time_intervals_per_day)
 
     def update_control_t(self, Pnet_t, t):
         """
@@ -403,17 +436,16 @@ class StorageAsset_3ph(Asset_3ph):
         """
         self.Pnet[t] = Pnet_t
         self.E[0] = self.E0
-        t_ems = self.simulation_time_series_hour_resolution / self.dt_ems
-        P_ratio = int(100*(abs(self.Pnet[t]/self.Pmax_abs)))
-        P_eff = self.eff[P_ratio-1]
+        t_ems_interval = self.t_ems_index[t]
+        P_eff = self.eff[_get_charging_efficiency_index(self.Pnet[t], self.Pmax_abs)]
         if self.Pnet[t] < 0:
-            if self.E[t] <= self.Emin[int(t*t_ems)]:
-                self.E[t] = self.Emin[int(t*t_ems)]
+            if self.E[t] <= self.Emin[t_ems_interval]:
+                self.E[t] = self.Emin[t_ems_interval]
                 self.Pnet[t] = 0
             self.E[t+1] = self.E[t] + (1/P_eff)*self.Pnet[t]*self.simulation_time_series_hour_resolution
         elif self.Pnet[t] >= 0:
-            if self.E[t] >= self.Emax[int(t*t_ems)]:
-                self.E[t] = self.Emax[int(t*t_ems)]
+            if self.E[t] >= self.Emax[t_ems_interval]:
+                self.E[t] = self.Emax[t_ems_interval]
                 self.Pnet[t] = 0
             self.E[t+1] = self.E[t] + P_eff*self.Pnet[t]*self.simulation_time_series_hour_resolution
 
@@ -1,8 +1,8 @@
 import json
+import logging
 import os
 from datetime import datetime
-from pathlib import Path
-from typing import List
+from typing import Mapping
 import numpy as np
 from src import assets, energy_system
 from src.buildings import Building
@@ -10,7 +10,7 @@ from src.markets import get_market
 from src.plot.plots import save_plot_demand_base_and_total_imported_power, save_plot_building_internal_temperature, \
     save_plot_hvac_consumed_active_power_in_kilowatts, save_plot_ambient_temperature, save_plot_import_periods, \
     save_plot_storage_asset_used_power_in_kilowatts
-from src.read import read_open_csv_files, read_case_data_from_yaml_file
+from src.read import read_open_csv_files
 import pandapower as pp
 from src.temperatures import check_initial_inside_degree_celsius
 from src.time_intervals import check_sum_of_daily_periods_in_hours_equals_twenty_four, \
@@ -18,12 +18,13 @@ from src.time_intervals import check_sum_of_daily_periods_in_hours_equals_twenty
 from src.data_strategy import get_ambient_temperature_in_degree_celsius_by_data_strategy, \
     get_building_electric_loads_by_data_strategy
 
+logger = logging.getLogger(__name__)
 
-def run_case(cases_file_path: str, yaml_files: List[str], input_case_data: dict, results_path: Path,
-             electric_load_file: str, electric_load_data_file_path: str, building_type: Building) -> None:
-    for yaml_file in yaml_files:
-        print('YAML FILE:', yaml_file)
-        case_data = read_case_data_from_yaml_file(cases_file_path=cases_file_path, file_name=yaml_file)
+
+def run_case(cases_data: Mapping[str, dict], input_case_data: Mapping, results_path: str, electric_load_file: str,
+             electric_load_data_file_path: str, building_type: Building) -> None:
+    for yaml_file, case_data in cases_data.items():
+        logger.info(f'YAML FILE: {yaml_file}')
         market_scenario = case_data['market']
 
         # STEP 0: Load data
@@ -99,9 +100,11 @@ def run_case(cases_file_path: str, yaml_files: List[str], input_case_data: dict,
         grid_2_voltage_level_in_kilo_volts: float = input_case_data["grid_2_voltage_level_in_kilo_volts"]
         grid_3_voltage_level_in_kilo_volts: float = input_case_data["grid_3_voltage_level_in_kilo_volts"]
 
-        bus_1 = pp.create_bus(network, vn_kv=grid_1_voltage_level_in_kilo_volts, name="bus 1")
-        bus_2 = pp.create_bus(network, vn_kv=grid_2_voltage_level_in_kilo_volts, name="bus 2")
-        bus_3 = pp.create_bus(network, vn_kv=grid_3_voltage_level_in_kilo_volts, name="bus 3")
+        bus_1, bus_2, bus_3 = pp.create_buses(network, nr_buses=3,
+                                              vn_kv=[grid_1_voltage_level_in_kilo_volts,
+                                                     grid_2_voltage_level_in_kilo_volts,
+                                                     grid_3_voltage_level_in_kilo_volts],
+                                              name=["bus 1", "bus 2", "bus 3"])
 
         pp.create_ext_grid(network, bus=bus_1, vm_pu=1.0, name="Grid Connection")
 
@@ -274,13 +277,13 @@ def run_case(cases_file_path: str, yaml_files: List[str], input_case_data: dict,
             round(
                 market.calculate_revenue(-market_active_power_in_kilowatts, simulation_time_series_resolution_in_hours),
                 2)
-        print('Revenue in euros:', revenue)
+        logger.info(f'Revenue in euros: {revenue}')
 
         current_time = datetime.now().strftime("%Y%m%d-%H%M%S")
         case_file_name = electric_load_file.split('.')[0]
         month = case_data['month']
-        plots_path = f'{results_path}/{current_time}_{month}_{case_file_name}'
-        os.mkdir(path=plots_path)
+        plots_path = os.path.join(results_path, f'{month:02d}', f'{current_time}_{case_file_name}')
+        os.makedirs(plots_path)
 
         save_plots = input_case_data['save_plots']
         if save_plots:
@@ -340,15 +343,16 @@ def run_case(cases_file_path: str, yaml_files: List[str], input_case_data: dict,
                                                             case=electric_load_file, current_time=current_time,
                                                             plots_path=plots_path)
 
-        input_case_data['photovoltaic_generation_data_file_path'] = case_data[
+        saved_input_case_data = dict(input_case_data)
+        saved_input_case_data['photovoltaic_generation_data_file_path'] = case_data[
             'photovoltaic_generation_data_file_path']
-        input_case_data['electric_load_data_file_path'] = electric_load_data_file_path
-        input_case_data['data_strategy'] = case_data['data_strategy']
-        input_case_data['ambient_temperature_file_path'] = case_data['ambient_temperature_file_path']
-        input_case_data['market'] = case_data['market']
+        saved_input_case_data['electric_load_data_file_path'] = electric_load_data_file_path
+        saved_input_case_data['data_strategy'] = case_data['data_strategy']
+        saved_input_case_data['ambient_temperature_file_path'] = case_data['ambient_temperature_file_path']
+        saved_input_case_data['market'] = case_data['market']
 
         with open(f"{plots_path}/input_case_data.json", "w") as outfile:
-            json.dump(input_case_data, outfile, indent=4)
+            json.dump(saved_input_case_data, outfile, indent=4)
 
         output_case_data = {
             'buses_voltage_angle_in_degrees': buses_voltage_angle_in_degrees.tolist(),
@@ -0,0 +1,69 @@
+from types import MappingProxyType
+
+INPUT_CASE_DATA = MappingProxyType({
+    # Photovoltaic generation
+    'rated_photovoltaic_kilowatts': 400,
+
+    # Time series resolutions
+    'simulation_time_series_resolution_in_minutes': 1,
+    'energy_management_system_time_series_resolution_in_minutes': 15,
+
+    # Battery system #TODO: to be added
+    'max_storage_asset_energy_in_kilowatt_hour': 500,
+    'min_storage_asset_energy_in_kilowatt_hour': 0,
+    'max_storage_asset_active_power_in_kilowatts': 500,
+    'min_storage_asset_active_power_in_kilowatts': 0,
+    'initial_storage_asset_energy_level_percentage': 80,
+    'required_storage_asset_terminal_energy_level_percentage': 100,
+    'storage_asset_absolute_active_power_in_kilowatts': None,
+    'storage_asset_degradation_ratio_in_euros_per_kilowatt_hour': None,
+    'storage_asset_charging_efficiency_percentage': 100,
+    'storage_asset_charging_efficiency_for_the_optimizer_percentage': 100,
+
+    # Building parameters
+    'max_inside_degree_celsius': 25,  # RITE Tabla 1.4.1.1 Condiciones interiores de diseño (https://www.boe.es/buscar/act.php?id=BOE-A-2007-15820)
+    'min_inside_degree_celsius': 21,  # RITE Tabla 1.4.1.1 Condiciones interiores de diseño (https://www.boe.es/buscar/act.php?id=BOE-A-2007-15820)
+    'initial_inside_degree_celsius': 21,
+    'max_consumed_electric_heating_kilowatts': 450,  # 3 units of Mitsubishi EAHV-M1500/1800YCL-N heat pump. Each unit provides 150 kW heating power
+    # https://les.mitsubishielectric.co.uk/products/commercial-heat-pumps-and-chillers/commercial-heat-pumps/eahv-r32-modular-air-source-heat-pump
+    'max_consumed_electric_cooling_kilowatts': 450,  # 3 units of Mitsubishi EAHV-M1500/1800YCL-N heat pump. Each unit provides 150 kW cooling power
+    # https://les.mitsubishielectric.co.uk/products/commercial-heat-pumps-and-chillers/commercial-heat-pumps/eahv-r32-modular-air-source-heat-pump
+    'heat_pump_coefficient_of_performance': 3.52,  # Mitsubishi EAHV-M1500/1800YCL-N heat pump
+    'chiller_coefficient_of_performance': 3.35,  # Mitsubishi EAHV-M1500/1800YCL-N heat pump
+    'building_thermal_capacitance_in_kilowatts_hour_per_degree_celsius': 500,
+    'building_thermal_resistance_in_degree_celsius_per_kilowatts': 0.0337,
+
+    # Cost parameters
+    'export_prices_in_euros_per_kilowatt_hour': 0.189,  # Average between 2022/01/01-2022/09/14 (https://www.esios.ree.es/es/analisis/1739?vis=1&start_date=01-01-2022T00%3A00&end_date=14-09-2022T23%3A55&compare_start_date=31-12-2021T00%3A00&groupby=day&compare_indicators=1013,1014,1015)
+    # Spanish Electric Tariff: 6.1TD (https://tarifasgasluz.com/pymes/tarifas-luz/seis-periodos)
+    # Iberdrola prices from here: https://tarifasgasluz.com/pymes/tarifas-luz#nueva-tarifa-pyme
+    # Periods from here: https://www.electricadealginet.com/wp-content/uploads/7-Industrias-tarifas-6.1-a-6.4.pdf
+    'import_period_prices': {'P1': 0.1395,
+                             'P2': 0.1278,
+                             'P3': 0.1110,
+                             'P4': 0.1014,
+                             'P5': 0.0927,
+                             'P6': 0.0871},
+    'demand_charge_in_euros_per_kilowatt': 0,  # Already considered in the import_period_prices
+    'max_import_kilowatts': 500,
+    'max_export_kilowatts': -500,
+
+    # Flexibility
+    'offered_kilowatts_in_frequency_response': 0,
+    'max_frequency_response_state_of_charge': 0.6,
+    'min_frequency_response_state_of_charge': 0.4,
+    'frequency_response_price_in_euros_per_kilowatt_hour': 0.0059,
+
+    # Grid parameters
+    'grid_1_voltage_level_in_kilo_volts': 20,
+    'grid_2_voltage_level_in_kilo_volts': 0.4,
+    'grid_3_voltage_level_in_kilo_volts': 0.4,
+    'transformer_apparent_power_in_mega_volt_ampere': 0.4,
+    'length_from_bus_2_to_bus_3_in_km': 0.1,
+
+    # Blackout
+    'blackout_start_time_in_hours': 11,
+    'blackout_stop_time_in_hours': 12.5,
+
+    'save_plots': False
+})
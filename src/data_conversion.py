@@ -5,12 +5,9 @@ import pandas as pd
 
 
 def convert_10_min_data_to_1_min_data(data: pd.DataFrame) -> np.ndarray:
+    minutes_per_day = 24 * 60
     dates = data['Date'].unique()
-    one_minute_data = pd.DataFrame(columns=data.columns)
-    for date in dates:
-        specific_date_data = data[data['Date'] == date]
-        next_day = str(date + 1)
-        specific_date_data.loc[pd.to_datetime(next_day)] = [0, 0, 0, 0, 0, next_day]
-        specific_date_data = specific_date_data.asfreq(freq='60S', method='pad')
-        one_minute_data = pd.concat([one_minute_data, specific_date_data])
-    return one_minute_data[:-1]
+    day_start_times = pd.DatetimeIndex([date.start_time for date in dates]).values
+    minutes_of_the_day = np.arange(minutes_per_day) * np.timedelta64(1, 'm')
+    one_minute_index = pd.DatetimeIndex((day_start_times[:, np.newaxis] + minutes_of_the_day).ravel())
+    return data.reindex(one_minute_index, method='pad')
@@ -1,16 +1,13 @@
 import datetime
-import os
+import functools
 from abc import abstractmethod, ABC
-from pathlib import Path
 from typing import Optional, Union
 import numpy as np
 import pandas as pd
 from scipy import signal
-from scipy.interpolate import interpolate
 
 from src.interpolation import get_extrapolated_array_from_hour_to_minutes
-from src.read import read_preprocessing_meteo_navarra_ambient_temperature_csv_data, \
-    read_meteo_navarra_ambient_temperature_csv_data
+from src.read import read_meteo_navarra_ambient_temperature_csv_data
 
 
 class DataStrategy(ABC):
@@ -29,8 +26,8 @@ class UKData(DataStrategy):
     def get_ambient_temperature_in_degree_celsius(self, number_of_energy_management_time_intervals_per_day: int,
                                                   predefined_ambient_temperature_in_degree_celsius: Optional[
                                                       float] = None, file_path: Optional[str] = None) -> np.array:
-        return predefined_ambient_temperature_in_degree_celsius * \
-               np.ones(number_of_energy_management_time_intervals_per_day)
+        return np.full(shape=number_of_energy_management_time_intervals_per_day,
+                       fill_value=predefined_ambient_temperature_in_degree_celsius, dtype=float)
 
     def get_building_electric_loads_per_minute(self, file_path: str, month: int = None) -> np.ndarray:
         electric_loads = pd.read_csv(file_path, index_col=0, parse_dates=True).values
@@ -41,12 +38,9 @@ class MeteoNavarraData(DataStrategy):
     def get_ambient_temperature_in_degree_celsius(self, number_of_energy_management_time_intervals_per_day: int,
                                                   predefined_ambient_temperature_in_degree_celsius: Optional[
                                                       float] = None, file_path: Optional[str] = None) -> np.array:
-        data = read_meteo_navarra_ambient_temperature_csv_data(file_path=file_path)
-        ambient_temperature_in_degree_celsius = data['DegreeCelsius']
-        resampled_ambient_temperature_in_degree_celsius = \
-            signal.resample(x=ambient_temperature_in_degree_celsius,
-                            num=number_of_energy_management_time_intervals_per_day)
-        return resampled_ambient_temperature_in_degree_celsius
+        return _get_resampled_meteo_navarra_ambient_temperature_in_degree_celsius(
+            file_path=file_path,
+            number_of_energy_management_time_intervals_per_day=number_of_energy_management_time_intervals_per_day)
 
     def get_building_electric_loads_per_minute(self, file_path: str, month: int) -> np.ndarray:
         df = pd.read_csv(file_path)
@@ -64,6 +58,19 @@ class MeteoNavarraData(DataStrategy):
         return get_extrapolated_array_from_hour_to_minutes(array_in_hours=active_power_in_kilowatts_per_hour)
 
 
+@functools.lru_cache(maxsize=None)
+def _get_resampled_meteo_navarra_ambient_temperature_in_degree_celsius(
+        file_path: str, number_of_energy_management_time_intervals_per_day: int) -> np.ndarray:
+    # every case of the same month reads the same file, so the resampled temperatures are kept (read-only)
+    data = read_meteo_navarra_ambient_temperature_csv_data(file_path=file_path)
+    ambient_temperature_in_degree_celsius = data['DegreeCelsius']
+    resampled_ambient_temperature_in_degree_celsius = \
+        signal.resample(x=ambient_temperature_in_degree_celsius,
+                        num=number_of_energy_management_time_intervals_per_day)
+    resampled_ambient_temperature_in_degree_celsius.setflags(write=False)
+    return resampled_ambient_temperature_in_degree_celsius
+
+
 def get_ambient_temperature_in_degree_celsius_by_data_strategy(
         case_data: dict, number_of_energy_management_time_intervals_per_day: int) -> np.ndarray:
     data_strategy = case_data["data_strategy"]
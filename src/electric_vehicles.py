@@ -1,9 +1,11 @@
+from typing import Union
+
 import numpy as np
 
 
 class ElectricVehicleFleet:
     def __init__(self,
-                 random_seed: int,
+                 random_seed: Union[int, np.random.Generator, np.random.RandomState, None],
                  number_of_electric_vehicles: int,
                  max_battery_capacity_in_kilowatts_per_hour: int,
                  max_electric_vehicle_charging_power: int,
@@ -15,6 +17,11 @@ class ElectricVehicleFleet:
 
         self.is_electric_vehicle_fleet_feasible_for_the_system = False
         self.random_seed = random_seed
+        # a legacy RandomState is kept as it is so that the fleets sampled by the original OPEN can be reproduced
+        if isinstance(random_seed, np.random.RandomState):
+            self.random_number_generator = random_seed
+        else:
+            self.random_number_generator = np.random.default_rng(random_seed)
         self.number_of_electric_vehicles = number_of_electric_vehicles
         self.max_electric_vehicle_energy_level = max_battery_capacity_in_kilowatts_per_hour
         self.max_electric_vehicle_charging_power = max_electric_vehicle_charging_power
@@ -27,39 +34,37 @@ class ElectricVehicleFleet:
         self.random_electric_vehicle_departure_time = self.get_random_electric_vehicle_departure_time()
         self.random_electric_vehicle_energy_levels = self.get_random_electric_vehicle_energy_levels()
 
+    def _get_random_integers(self, low: int, high: int):
+        if isinstance(self.random_number_generator, np.random.RandomState):
+            return self.random_number_generator.randint(low, high, self.number_of_electric_vehicles)
+        return self.random_number_generator.integers(low, high, self.number_of_electric_vehicles)
+
     def get_random_electric_vehicle_arrival_time(self):
-        return np.random.randint(self.electric_vehicle_arrival_time_start,
-                                 self.electric_vehicle_arrival_time_end,
-                                 self.number_of_electric_vehicles)
+        return self._get_random_integers(low=self.electric_vehicle_arrival_time_start,
+                                         high=self.electric_vehicle_arrival_time_end)
 
     def get_random_electric_vehicle_departure_time(self):
-        return np.random.randint(self.electric_vehicle_departure_time_start,
-                                 self.electric_vehicle_departure_time_end,
-                                 self.number_of_electric_vehicles)
+        return self._get_random_integers(low=self.electric_vehicle_departure_time_start,
+                                         high=self.electric_vehicle_departure_time_end)
 
     def get_random_electric_vehicle_energy_levels(self):
-        return self.max_electric_vehicle_energy_level * np.random.uniform(0, 1, self.number_of_electric_vehicles)
+        return self.max_electric_vehicle_energy_level * \
+               self.random_number_generator.uniform(0, 1, self.number_of_electric_vehicles)
 
     def check_electric_vehicle_fleet_charging_feasibility(self):
-        for electric_vehicle_number in range(self.number_of_electric_vehicles):
-            random_electric_vehicle_departure_time = self.random_electric_vehicle_departure_time[electric_vehicle_number]
-            random_electric_vehicle_arrival_time = self.random_electric_vehicle_arrival_time[electric_vehicle_number]
-            self.random_electric_vehicle_departure_time[electric_vehicle_number] = \
-                np.max([random_electric_vehicle_departure_time, random_electric_vehicle_arrival_time])
+        random_electric_vehicle_departure_time = self.random_electric_vehicle_departure_time
+        random_electric_vehicle_arrival_time = self.random_electric_vehicle_arrival_time
+        time_between_departure_and_arrival = random_electric_vehicle_departure_time - \
+                                             random_electric_vehicle_arrival_time
+        self.random_electric_vehicle_departure_time = np.maximum(random_electric_vehicle_departure_time,
+                                                                 random_electric_vehicle_arrival_time)
 
-            energy_levels = self.random_electric_vehicle_energy_levels[electric_vehicle_number]
-            time_between_departure_and_arrival = random_electric_vehicle_departure_time - \
-                                                 random_electric_vehicle_arrival_time
-            charged_energy_between_departure_and_arrival = \
-                self.max_electric_vehicle_charging_power * time_between_departure_and_arrival
-            difference_between_max_and_charged_energy_levels = \
-                self.max_electric_vehicle_energy_level - charged_energy_between_departure_and_arrival
-            self.random_electric_vehicle_energy_levels[electric_vehicle_number] =\
-                np.max([energy_levels, difference_between_max_and_charged_energy_levels])
+        charged_energy_between_departure_and_arrival = \
+            self.max_electric_vehicle_charging_power * time_between_departure_and_arrival
+        difference_between_max_and_charged_energy_levels = \
+            self.max_electric_vehicle_energy_level - charged_energy_between_departure_and_arrival
+        self.random_electric_vehicle_energy_levels = np.maximum(self.random_electric_vehicle_energy_levels,
+                                                                difference_between_max_and_charged_energy_levels)
 
-        condition = all(electric_vehicle_energy_level >= 0 for electric_vehicle_energy_level
-                        in self.random_electric_vehicle_energy_levels)
-        if condition:
+        if np.all(self.random_electric_vehicle_energy_levels >= 0):
             self.is_electric_vehicle_fleet_feasible_for_the_system = True
-        else:
-            pass
@@ -30,31 +30,29 @@ time series.
 
 import copy
 import datetime
+import importlib.util
 from typing import List
 import pandapower as pp
 import numpy as np
-import picos as pic
-from picos import RealVariable
+from scipy import sparse
 from src.assets import NonDispatchableAsset, StorageAsset
+from src.linear_program import LinearProgram
 from src.markets import Market
 from src.network_3_phase_pf import ThreePhaseNetwork
+from src.power_flow import run_batched_z_bus_power_flow
 from src.time_intervals import get_number_of_time_intervals_per_day, get_range_array_from_between_hours
 
+# lightsim2grid is optional; older pandapower versions raise instead of falling back when it is requested but missing
+IS_LIGHTSIM2GRID_INSTALLED = importlib.util.find_spec('lightsim2grid') is not None
 
-def get_temperature_constraint_for_no_initial_time(alpha: float, beta: float, gamma: float,
-                                                   previous_building_internal_temperature_in_celsius_degrees: float,
-                                                   chiller_coefficient_of_performance: float,
-                                                   previous_cooling_active_power_in_kilowatts: float,
-                                                   heat_pump_coefficient_of_performance: float,
-                                                   previous_heating_active_power_in_kilowatts: float,
-                                                   previous_ambient_temperature_in_degree_celsius: float):
-    temperature_constraint = \
-        alpha * previous_building_internal_temperature_in_celsius_degrees \
-        - beta * chiller_coefficient_of_performance * previous_cooling_active_power_in_kilowatts \
-        + beta * heat_pump_coefficient_of_performance * previous_heating_active_power_in_kilowatts \
-        + gamma * previous_ambient_temperature_in_degree_celsius
 
-    return temperature_constraint
+def get_network_simulation_results_dtype(number_of_buses: int) -> np.dtype:
+    return np.dtype([('buses_voltage_in_per_unit', np.float64, (number_of_buses,)),
+                     ('buses_voltage_angle_in_degrees', np.float64, (number_of_buses,)),
+                     ('buses_active_power_in_kilowatts', np.float64, (number_of_buses,)),
+                     ('buses_reactive_power_in_kilovolt_ampere_reactive', np.float64, (number_of_buses,)),
+                     ('market_active_power_in_kilowatts', np.float64),
+                     ('market_reactive_power_in_kilovolt_ampere_reactive', np.float64)])
 
 
 class EnergySystem:
@@ -83,25 +81,27 @@ class EnergySystem:
             time_series_resolution_in_hours=self.simulation_time_series_resolution_in_hours)
         self.number_of_energy_management_system_time_intervals_per_day = get_number_of_time_intervals_per_day(
             time_series_resolution_in_hours=self.energy_management_system_time_series_resolution_in_hours)
+        if self.number_of_time_intervals_per_day % self.number_of_energy_management_system_time_intervals_per_day != 0:
+            raise ValueError(f'The energy management system time series resolution '
+                             f'({self.energy_management_system_time_series_resolution_in_hours} h) must be a multiple '
+                             f'of the simulation time series resolution '
+                             f'({self.simulation_time_series_resolution_in_hours} h)')
+        # every energy management system time interval spans this many simulation time intervals
+        self.number_of_time_intervals_per_energy_management_system_time_interval = \
+            self.number_of_time_intervals_per_day // self.number_of_energy_management_system_time_intervals_per_day
         self.blackout_start_time_in_hours = blackout_start_time_in_hours
         self.blackout_stop_time_in_hours = blackout_stop_time_in_hours
 
     def _get_non_dispatchable_assets_active_power_in_kilowatts(self):
-        return sum([non_dispatchable_asset.active_power_in_kilowatts for non_dispatchable_asset in
-                    self.non_dispatchable_assets])
+        return np.sum([non_dispatchable_asset.active_power_in_kilowatts for non_dispatchable_asset in
+                       self.non_dispatchable_assets], axis=0)
 
     def _resample_non_dispatchable_assets_active_power_in_kilowatts(self,
                                                                     non_dispatchable_assets_active_power_in_kilowatts):
-        demand_active_power_in_kilowatts_for_the_energy_management_system = \
-            np.zeros(self.number_of_energy_management_system_time_intervals_per_day)
-        for t_ems in range(self.number_of_energy_management_system_time_intervals_per_day):
-            t_indexes = (t_ems * self.energy_management_system_time_series_resolution_in_hours /
-                         self.simulation_time_series_resolution_in_hours \
-                         + np.arange(0, self.energy_management_system_time_series_resolution_in_hours /
-                                     self.simulation_time_series_resolution_in_hours)).astype(int)
-            demand_active_power_in_kilowatts_for_the_energy_management_system[t_ems] = \
-                np.mean(non_dispatchable_assets_active_power_in_kilowatts[t_indexes])
-        return demand_active_power_in_kilowatts_for_the_energy_management_system
+        # each energy management system time interval is the mean of the simulation time intervals it spans
+        return non_dispatchable_assets_active_power_in_kilowatts.reshape(
+            self.number_of_energy_management_system_time_intervals_per_day,
+            self.number_of_time_intervals_per_energy_management_system_time_interval).mean(axis=1)
 
     # Open Loop Control Methods
     def run_single_copper_plate_network_optimization_model(self):
@@ -130,11 +130,13 @@ class EnergySystem:
         # setup and run a basic energy optimisation
         # (single copper plate network model)
         # STEP 0: setup variables
-        problem = pic.Problem()
+        problem = LinearProgram()
 
         number_of_storage_assets = len(self.storage_assets)
         number_of_buildings = len(self.building_assets)
         number_of_dispatchable_assets = number_of_storage_assets + number_of_buildings
+        if number_of_dispatchable_assets == 0:
+            raise ValueError('No dispatchable assets.')
 
         non_dispatchable_assets_active_power_in_kilowatts = \
             self._get_non_dispatchable_assets_active_power_in_kilowatts()
@@ -143,41 +145,44 @@ class EnergySystem:
                 non_dispatchable_assets_active_power_in_kilowatts=non_dispatchable_assets_active_power_in_kilowatts)
 
         # STEP 1: set up decision variables
-        controllable_assets_active_power_in_kilowatts = RealVariable(
-            name='controllable_assets_active_power_in_kilowatts',
-            shape=(self.number_of_energy_management_system_time_intervals_per_day, number_of_dispatchable_assets),
+        # Every variable block is stored asset by asset, each asset holding one value per time interval. The names
+        # below hold the index of the first variable of each block
+        number_of_energy_management_system_time_intervals_per_day = \
+            self.number_of_energy_management_system_time_intervals_per_day
+        controllable_assets_active_power_in_kilowatts = problem.add_variables(
+            number_of_variables=number_of_energy_management_system_time_intervals_per_day *
+                                number_of_dispatchable_assets,
             lower=0)
-        for number_of_building in np.arange(0, number_of_buildings):
-            cooling_active_power_in_kilowatts = RealVariable(
-                name='cooling_active_power_in_kilowatts',
-                shape=(self.number_of_energy_management_system_time_intervals_per_day, number_of_buildings),
-                lower=0, upper=self.building_assets[number_of_building].max_consumed_electric_cooling_kilowatts)
-            heating_active_power_in_kilowatts = RealVariable(
-                name='heating_active_power_in_kilowatts',
-                shape=(self.number_of_energy_management_system_time_intervals_per_day, number_of_buildings),
-                lower=0, upper=self.building_assets[number_of_building].max_consumed_electric_heating_kilowatts)
-            building_internal_temperature_in_celsius_degrees = RealVariable(
-                name='building_internal_temperature_in_celsius_degrees',
-                shape=(self.number_of_energy_management_system_time_intervals_per_day, number_of_buildings),
-                lower=self.building_assets[number_of_building].min_inside_degree_celsius,
-                upper=self.building_assets[number_of_building].max_inside_degree_celsius)
-
-        active_power_imports_in_kilowatts = RealVariable(
-            name='active_power_imports_in_kilowatts',
-            shape=(self.number_of_energy_management_system_time_intervals_per_day, 1),
+        cooling_active_power_in_kilowatts = problem.add_variables(
+            number_of_variables=number_of_energy_management_system_time_intervals_per_day * number_of_buildings,
+            lower=0,
+            upper=np.repeat([building_asset.max_consumed_electric_cooling_kilowatts
+                             for building_asset in self.building_assets],
+                            number_of_energy_management_system_time_intervals_per_day))
+        heating_active_power_in_kilowatts = problem.add_variables(
+            number_of_variables=number_of_energy_management_system_time_intervals_per_day * number_of_buildings,
+            lower=0,
+            upper=np.repeat([building_asset.max_consumed_electric_heating_kilowatts
+                             for building_asset in self.building_assets],
+                            number_of_energy_management_system_time_intervals_per_day))
+        building_internal_temperature_in_celsius_degrees = problem.add_variables(
+            number_of_variables=number_of_energy_management_system_time_intervals_per_day * number_of_buildings,
+            lower=np.ravel([building_asset.min_inside_degree_celsius for building_asset in self.building_assets]),
+            upper=np.ravel([building_asset.max_inside_degree_celsius for building_asset in self.building_assets]))
+
+        active_power_imports_in_kilowatts = problem.add_variables(
+            number_of_variables=number_of_energy_management_system_time_intervals_per_day,
             lower=0, upper=self.market.max_import_kilowatts)
-        active_power_exports_in_kilowatts = RealVariable(
-            name='active_power_exports_in_kilowatts',
-            shape=(self.number_of_energy_management_system_time_intervals_per_day, 1),
+        active_power_exports_in_kilowatts = problem.add_variables(
+            number_of_variables=number_of_energy_management_system_time_intervals_per_day,
             lower=0, upper=self.market.max_import_kilowatts)
         # (positive) maximum demand dummy variable
-        max_active_power_demand_in_kilowatts = RealVariable(
-            name='max_active_power_demand_in_kilowatts', shape=1, lower=0)
+        max_active_power_demand_in_kilowatts = problem.add_variables(number_of_variables=1, lower=0)
+        # energy change of the storage assets since the start of the day, at the end of every time interval
+        storage_assets_energy_change_in_kilowatt_hour = problem.add_variables(
+            number_of_variables=number_of_energy_management_system_time_intervals_per_day * number_of_storage_assets,
+            lower=-np.inf)
         # STEP 2: set up constraints
-        asum_np = np.tril(np.ones([self.number_of_energy_management_system_time_intervals_per_day,
-                                   self.number_of_energy_management_system_time_intervals_per_day])).astype('double')
-        # lower triangle matrix summing powers
-        asum = pic.Constant('asum', asum_np)
 
         self.add_linear_building_thermal_model_constraints_to_the_problem(
             number_of_buildings=number_of_buildings, problem=problem,
@@ -189,11 +194,13 @@ class EnergySystem:
         self.add_linear_battery_model_constraints_to_the_problem(
             number_of_storage_assets=number_of_storage_assets, problem=problem,
             controllable_assets_active_power_in_kilowatts=controllable_assets_active_power_in_kilowatts,
-            number_of_buildings=number_of_buildings, asum=asum)
+            number_of_buildings=number_of_buildings,
+            storage_assets_energy_change_in_kilowatt_hour=storage_assets_energy_change_in_kilowatt_hour)
 
         self.add_import_and_export_constraints_to_the_problem(
             problem=problem,
             controllable_assets_active_power_in_kilowatts=controllable_assets_active_power_in_kilowatts,
+            number_of_dispatchable_assets=number_of_dispatchable_assets,
             resampled_non_dispatchable_assets_active_power_in_kilowatts=
             resampled_non_dispatchable_assets_active_power_in_kilowatts,
             active_power_imports_in_kilowatts=active_power_imports_in_kilowatts,
@@ -203,79 +210,71 @@ class EnergySystem:
             blackout_stop_time_in_hours=self.blackout_stop_time_in_hours)
 
         self.add_frequency_response_constraints_to_the_problem(
-            number_of_storage_assets=number_of_storage_assets, problem=problem, asum=asum,
-            controllable_assets_active_power_in_kilowatts=controllable_assets_active_power_in_kilowatts,
-            number_of_buildings=number_of_buildings)
+            number_of_storage_assets=number_of_storage_assets, problem=problem,
+            storage_assets_energy_change_in_kilowatt_hour=storage_assets_energy_change_in_kilowatt_hour)
 
         # STEP 3: set up objective
-        max_demand_charge_in_euros = \
-            self.market.max_demand_charge_in_euros_per_kWh * max_active_power_demand_in_kilowatts
-
-        import_and_export_cost_in_euros = sum(
-            self.market.import_prices_in_euros_per_kilowatt_hour[t] * active_power_imports_in_kilowatts[t]
-            - self.market.export_price_time_series_in_euros_per_kWh[t]  # Negative as it is a profit
-            * active_power_exports_in_kilowatts[t]
-            for t in range(self.number_of_energy_management_system_time_intervals_per_day))
-
-        expression = max_demand_charge_in_euros + import_and_export_cost_in_euros
-        problem.set_objective(direction='min', expression=expression)
+        costs = np.zeros(problem.number_of_variables)
+        costs[max_active_power_demand_in_kilowatts] = self.market.max_demand_charge_in_euros_per_kWh
+        costs[active_power_imports_in_kilowatts:
+              active_power_imports_in_kilowatts + number_of_energy_management_system_time_intervals_per_day] = \
+            self.market.import_prices_in_euros_per_kilowatt_hour
+        costs[active_power_exports_in_kilowatts:
+              active_power_exports_in_kilowatts + number_of_energy_management_system_time_intervals_per_day] = \
+            -self.market.export_price_time_series_in_euros_per_kWh  # Negative as it is a profit
+        problem.set_objective(costs=costs)
 
         # STEP 4: solve the optimisation
 
         print('*** SOLVING THE OPTIMISATION PROBLEM ***')
         optimization_start_time = datetime.datetime.now()
-        problem.solve(verbosity=0)
+        solution = problem.solve()
         optimization_end_time = datetime.datetime.now()
         optimization_time = optimization_end_time - optimization_start_time
         print('*** OPTIMISATION COMPLETE ***')
         print('*** OPTIMISATION TIME: ', optimization_time, '***')
 
-        controllable_assets_active_power_in_kilowatts = controllable_assets_active_power_in_kilowatts.value
-        active_power_imports_in_kilowatts = active_power_imports_in_kilowatts.value
-        active_power_exports_in_kilowatts = active_power_exports_in_kilowatts.value
+        controllable_assets_active_power_in_kilowatts = \
+            solution[controllable_assets_active_power_in_kilowatts:
+                     controllable_assets_active_power_in_kilowatts +
+                     number_of_energy_management_system_time_intervals_per_day * number_of_dispatchable_assets] \
+            .reshape(number_of_dispatchable_assets, number_of_energy_management_system_time_intervals_per_day).T
+        active_power_imports_in_kilowatts = \
+            solution[active_power_imports_in_kilowatts:
+                     active_power_imports_in_kilowatts + number_of_energy_management_system_time_intervals_per_day] \
+            .reshape(number_of_energy_management_system_time_intervals_per_day, 1)
+        active_power_exports_in_kilowatts = \
+            solution[active_power_exports_in_kilowatts:
+                     active_power_exports_in_kilowatts + number_of_energy_management_system_time_intervals_per_day] \
+            .reshape(number_of_energy_management_system_time_intervals_per_day, 1)
         resampled_non_dispatchable_assets_active_power_in_kilowatts = \
             resampled_non_dispatchable_assets_active_power_in_kilowatts
 
         if number_of_buildings > 0:
             # Store internal temperature inside object
-            building_internal_temperature_in_celsius_degrees = building_internal_temperature_in_celsius_degrees.value
+            building_internal_temperature_in_celsius_degrees = \
+                solution[building_internal_temperature_in_celsius_degrees:
+                         building_internal_temperature_in_celsius_degrees +
+                         number_of_energy_management_system_time_intervals_per_day * number_of_buildings] \
+                .reshape(number_of_buildings, number_of_energy_management_system_time_intervals_per_day)
             for number_of_building in range(number_of_buildings):
                 self.building_assets[number_of_building].building_internal_temperature_in_celsius_degrees = \
-                    building_internal_temperature_in_celsius_degrees[:, number_of_building]
+                    building_internal_temperature_in_celsius_degrees[number_of_building]
 
-        active_power_consumed_by_the_buildings_in_kilowatts = \
-            controllable_assets_active_power_in_kilowatts[:, :number_of_buildings]
-        if number_of_storage_assets > 0 and number_of_buildings > 0:
-            storage_asset_accumulated_power_in_kilowatts = \
+        output = {'active_power_imports_in_kilowatts': active_power_imports_in_kilowatts,
+                  'active_power_exports_in_kilowatts': active_power_exports_in_kilowatts,
+                  'resampled_non_dispatchable_assets_active_power_in_kilowatts':
+                      resampled_non_dispatchable_assets_active_power_in_kilowatts}
+        if number_of_buildings > 0:
+            output['active_power_consumed_by_the_buildings_in_kilowatts'] = \
+                controllable_assets_active_power_in_kilowatts[:, :number_of_buildings]
+        if number_of_storage_assets > 0:
+            output['storage_asset_accumulated_power_in_kilowatts'] = \
                 np.array(controllable_assets_active_power_in_kilowatts)[:, 0]
-            output = {
-                'active_power_consumed_by_the_buildings_in_kilowatts':
-                    active_power_consumed_by_the_buildings_in_kilowatts,
-                'storage_asset_accumulated_power_in_kilowatts': storage_asset_accumulated_power_in_kilowatts,
-                'charge_discharge_power_for_storage_assets_in_kilowatts':  # TODO: this might not be OK, but is not used
-                    controllable_assets_active_power_in_kilowatts[
-                    :, number_of_buildings:number_of_storage_assets + number_of_buildings],
-                'active_power_imports_in_kilowatts': active_power_imports_in_kilowatts,
-                'active_power_exports_in_kilowatts': active_power_exports_in_kilowatts,
-                'resampled_non_dispatchable_assets_active_power_in_kilowatts':
-                    resampled_non_dispatchable_assets_active_power_in_kilowatts}
-        elif number_of_storage_assets == 0 and number_of_buildings > 0:
-            output = {'active_power_consumed_by_the_buildings_in_kilowatts':
-                          active_power_consumed_by_the_buildings_in_kilowatts,
-                      'active_power_imports_in_kilowatts': active_power_imports_in_kilowatts,
-                      'active_power_exports_in_kilowatts': active_power_exports_in_kilowatts,
-                      'resampled_non_dispatchable_assets_active_power_in_kilowatts':
-                          resampled_non_dispatchable_assets_active_power_in_kilowatts}
-        elif number_of_storage_assets > 0 and number_of_buildings == 0:
-            output = {
-                'charge_discharge_power_for_storage_assets_in_kilowatts': controllable_assets_active_power_in_kilowatts[
-                                                                          :, :number_of_storage_assets],
-                'active_power_imports_in_kilowatts': active_power_imports_in_kilowatts,
-                'active_power_exports_in_kilowatts': active_power_exports_in_kilowatts,
-                'resampled_non_dispatchable_assets_active_power_in_kilowatts':
-                    resampled_non_dispatchable_assets_active_power_in_kilowatts}
-        else:
-            raise ValueError('No dispatchable assets.')
+            # TODO: this might not be OK, but is not used
+            output['charge_discharge_power_for_storage_assets_in_kilowatts'] = \
+                controllable_assets_active_power_in_kilowatts[
+                :, number_of_buildings:number_of_storage_assets + number_of_buildings]
 
         return output
 
@@ -317,7 +316,6 @@ class EnergySystem:
 
         number_of_storage_assets = len(self.storage_assets)
         number_of_buildings = len(self.building_assets)
-        number_of_non_dispatchable_assets = len(self.non_dispatchable_assets)
 
         imported_active_power_in_kilowatts = energy_management_system_output['active_power_imports_in_kilowatts']
         exported_active_power_in_kilowatts = energy_management_system_output['active_power_exports_in_kilowatts']
@@ -357,170 +355,208 @@ class EnergySystem:
         active_power_bus_demand_in_kilowatts = np.zeros([self.number_of_time_intervals_per_day, number_of_buses])
         reactive_power_bus_demand_in_kilovolt_ampere_reactive = \
             np.zeros([self.number_of_time_intervals_per_day, number_of_buses])
-        if number_of_storage_assets > 0:
-            # calculate the total real and reactive power demand at each bus
-            for i in range(number_of_storage_assets):
-                non_dispatchable_assets_bus_id = self.storage_assets[i].bus_id
-                active_power_bus_demand_in_kilowatts[:, non_dispatchable_assets_bus_id] += \
-                    self.storage_assets[i].active_power_in_kilowatts
-        if number_of_buildings > 0:
-            # calculate the total real and reactive power demand at each bus
-            for i in range(number_of_buildings):
-                building_bus_id = self.building_assets[i].bus_id
-                active_power_bus_demand_in_kilowatts[:, building_bus_id] += \
-                    self.building_assets[i].active_power_in_kilowatts
-                reactive_power_bus_demand_in_kilovolt_ampere_reactive[:, building_bus_id] += self.building_assets[
-                    i].reactive_power
-        for i in range(number_of_non_dispatchable_assets):
-            non_dispatchable_assets_bus_id = self.non_dispatchable_assets[i].bus_id
-            active_power_bus_demand_in_kilowatts[:, non_dispatchable_assets_bus_id] += \
-                self.non_dispatchable_assets[i].active_power_in_kilowatts
-            reactive_power_bus_demand_in_kilovolt_ampere_reactive[:, non_dispatchable_assets_bus_id] += \
-                self.non_dispatchable_assets[i].reactive_power
-
-        buses_voltage_in_per_unit = np.zeros([self.number_of_time_intervals_per_day, number_of_buses])
-        buses_voltage_angle_in_degrees = np.zeros([self.number_of_time_intervals_per_day, number_of_buses])
-        buses_active_power_in_kilowatts = np.zeros([self.number_of_time_intervals_per_day, number_of_buses])
-        buses_reactive_power_in_kilovolt_ampere_reactive = np.zeros([self.number_of_time_intervals_per_day,
-                                                                     number_of_buses])
-        market_active_power_in_kilowatts = np.zeros(self.number_of_time_intervals_per_day)
-        market_reactive_power_in_kilovolt_ampere_reactive = np.zeros(self.number_of_time_intervals_per_day)
+        # calculate the total real and reactive power demand at each bus
+        active_power_assets = self.storage_assets + self.building_assets + self.non_dispatchable_assets
+        np.add.at(active_power_bus_demand_in_kilowatts,
+                  (slice(None), [asset.bus_id for asset in active_power_assets]),
+                  np.column_stack([asset.active_power_in_kilowatts for asset in active_power_assets]))
+        reactive_power_assets = self.building_assets + self.non_dispatchable_assets
+        np.add.at(reactive_power_bus_demand_in_kilovolt_ampere_reactive,
+                  (slice(None), [asset.bus_id for asset in reactive_power_assets]),
+                  np.column_stack([asset.reactive_power for asset in reactive_power_assets]))
+
+        # one record per time interval with a named field per simulated quantity
+        network_simulation_results = np.zeros(self.number_of_time_intervals_per_day,
+                                              dtype=get_network_simulation_results_dtype(
+                                                  number_of_buses=number_of_buses))
+        buses_voltage_in_per_unit = network_simulation_results['buses_voltage_in_per_unit']
+        buses_voltage_angle_in_degrees = network_simulation_results['buses_voltage_angle_in_degrees']
+        buses_active_power_in_kilowatts = network_simulation_results['buses_active_power_in_kilowatts']
+        buses_reactive_power_in_kilovolt_ampere_reactive = \
+            network_simulation_results['buses_reactive_power_in_kilovolt_ampere_reactive']
+        market_active_power_in_kilowatts = network_simulation_results['market_active_power_in_kilowatts']
+        market_reactive_power_in_kilovolt_ampere_reactive = \
+            network_simulation_results['market_reactive_power_in_kilovolt_ampere_reactive']
 
         simulation_start_time = datetime.datetime.now()
         print('*** SIMULATING THE NETWORK ***')
-        for number_of_time_interval_per_day in range(self.number_of_time_intervals_per_day):
-            # for each time interval:
-            # set up a 20230703-090301 of the network for simulation interval number_of_time_interval_per_day
-            network_copy = copy.deepcopy(self.network)
-            for non_dispatchable_assets_bus_id in range(number_of_buses):
-                specific_active_power_bus_demand_in_kilowatts = \
-                    active_power_bus_demand_in_kilowatts[
-                        number_of_time_interval_per_day, non_dispatchable_assets_bus_id]
-                specific_reactive_power_bus_demand_in_kilovolt_ampere_reactive = \
-                    reactive_power_bus_demand_in_kilovolt_ampere_reactive[number_of_time_interval_per_day,
-                    non_dispatchable_assets_bus_id]
-                # add P,Q loads to the network 20230703-090301
-                pp.create_load(network_copy, non_dispatchable_assets_bus_id,
-                               specific_active_power_bus_demand_in_kilowatts / 1e3,
-                               specific_reactive_power_bus_demand_in_kilovolt_ampere_reactive / 1e3)
-            # run the power flow simulation
-            max_iteration = 100
-            pp.runpp(net=network_copy, max_iteration=max_iteration)  # or “nr”
-
+        # set up a copy of the network with one load per bus, whose set points are updated in place at every
+        # simulation interval
+        network_copy = copy.deepcopy(self.network)
+        load_indexes = pp.create_loads(network_copy, buses=np.arange(number_of_buses),
+                                       p_mw=np.zeros(number_of_buses), q_mvar=np.zeros(number_of_buses))
+        # solve the first simulation interval with the Newton-Raphson power flow, which also builds the admittance
+        # matrix of the network
+        self._run_newton_raphson_power_flow(
+            network=network_copy, load_indexes=load_indexes, number_of_time_interval_per_day=0,
+            active_power_bus_demand_in_kilowatts=active_power_bus_demand_in_kilowatts,
+            reactive_power_bus_demand_in_kilovolt_ampere_reactive=
+            reactive_power_bus_demand_in_kilovolt_ampere_reactive,
+            network_simulation_results=network_simulation_results)
+        # the admittance matrix does not change between simulation intervals, so the power flows of all the
+        # intervals are solved together with the batched Z-bus iteration when the network only has PQ buses and
+        # every bus is part of the power flow model (out of service or isolated buses are left out of it)
+        is_power_flow_converged = np.zeros(self.number_of_time_intervals_per_day, dtype=bool)
+        is_power_flow_converged[0] = True
+        power_flow_model = network_copy._ppc['internal']
+        bus_lookup = network_copy._pd2ppc_lookups['bus'][network_copy.bus.index.to_numpy()]
+        if power_flow_model['pv'].size == 0 and len(network_copy.ext_grid) == 1 and \
+                np.all(bus_lookup < power_flow_model['Ybus'].shape[0]):
+            is_power_flow_converged[1:] = self._run_batched_power_flow(
+                network=network_copy, power_flow_model=power_flow_model,
+                active_power_bus_demand_in_kilowatts=active_power_bus_demand_in_kilowatts,
+                reactive_power_bus_demand_in_kilovolt_ampere_reactive=
+                reactive_power_bus_demand_in_kilovolt_ampere_reactive,
+                network_simulation_results=network_simulation_results)[1:]
+        # fall back to the Newton-Raphson power flow for the intervals where the batched iteration did not converge
+        for number_of_time_interval_per_day in np.flatnonzero(~is_power_flow_converged):
+            self._run_newton_raphson_power_flow(
+                network=network_copy, load_indexes=load_indexes,
+                number_of_time_interval_per_day=number_of_time_interval_per_day,
+                active_power_bus_demand_in_kilowatts=active_power_bus_demand_in_kilowatts,
+                reactive_power_bus_demand_in_kilovolt_ampere_reactive=
+                reactive_power_bus_demand_in_kilovolt_ampere_reactive,
+                network_simulation_results=network_simulation_results)
             if number_of_time_interval_per_day % 100 == 0:
                 print('network simulation complete for number_of_time_interval_per_day = '
                       + str(number_of_time_interval_per_day) + ' of ' + str(self.number_of_time_intervals_per_day))
-            market_active_power_in_kilowatts[number_of_time_interval_per_day] = \
-                network_copy.res_ext_grid['p_mw'][0] * 1e3
-            market_reactive_power_in_kilovolt_ampere_reactive[number_of_time_interval_per_day] = \
-                network_copy.res_ext_grid['q_mvar'][0] * 1e3
-            for number_of_bus in range(number_of_buses):
-                buses_voltage_in_per_unit[number_of_time_interval_per_day, number_of_bus] = \
-                    network_copy.res_bus['vm_pu'][number_of_bus]
-                buses_voltage_angle_in_degrees[number_of_time_interval_per_day, number_of_bus] = \
-                    network_copy.res_bus['va_degree'][number_of_bus]
-                buses_active_power_in_kilowatts[number_of_time_interval_per_day, number_of_bus] = \
-                    network_copy.res_bus['p_mw'][number_of_bus] * 1e3
-                buses_reactive_power_in_kilovolt_ampere_reactive[number_of_time_interval_per_day, number_of_bus] = \
-                    network_copy.res_bus['q_mvar'][number_of_bus] * 1e3
 
         print('*** NETWORK SIMULATION COMPLETE ***')
         simulation_end_time = datetime.datetime.now()
         simulation_time = simulation_end_time - simulation_start_time
         print('*** SIMULATION TIME: ', simulation_time, '***')
 
-        if number_of_storage_assets > 0 and number_of_buildings > 0:
-            output = {'buses_voltage_in_per_unit': buses_voltage_in_per_unit,
-                      'buses_voltage_angle_in_degrees': buses_voltage_angle_in_degrees,
-                      'buses_active_power_in_kilowatts': buses_active_power_in_kilowatts,
-                      'buses_reactive_power_in_kilovolt_ampere_reactive':
-                          buses_reactive_power_in_kilovolt_ampere_reactive,
-                      'market_active_power_in_kilowatts': market_active_power_in_kilowatts,
-                      'market_reactive_power_in_kilovolt_ampere_reactive':
-                          market_reactive_power_in_kilovolt_ampere_reactive,
-                      'storage_asset_charge_or_discharge_power_in_kilowatts':
-                          storage_asset_charge_or_discharge_power_in_kilowatts,
-                      'storage_asset_accumulated_power_in_kilowatts': storage_asset_accumulated_power_in_kilowatts,
-                      'building_power_consumption_in_kilowatts': building_power_consumption_in_kilowatts,
-                      'imported_active_power_in_kilowatts': imported_active_power_in_kilowatts,
-                      'exported_active_power_in_kilowatts': exported_active_power_in_kilowatts,
-                      'active_power_demand_in_kilowatts': active_power_demand_in_kilowatts}
-        elif number_of_storage_assets == 0 and number_of_buildings > 0:
-            output = {'buses_voltage_in_per_unit': buses_voltage_in_per_unit,
-                      'buses_voltage_angle_in_degrees': buses_voltage_angle_in_degrees,
-                      'buses_active_power_in_kilowatts': buses_active_power_in_kilowatts,
-                      'buses_reactive_power_in_kilovolt_ampere_reactive':
-                          buses_reactive_power_in_kilovolt_ampere_reactive,
-                      'market_active_power_in_kilowatts': market_active_power_in_kilowatts,
-                      'market_reactive_power_in_kilovolt_ampere_reactive':
-                          market_reactive_power_in_kilovolt_ampere_reactive,
-                      'building_power_consumption_in_kilowatts': building_power_consumption_in_kilowatts,
-                      'imported_active_power_in_kilowatts': imported_active_power_in_kilowatts,
-                      'exported_active_power_in_kilowatts': exported_active_power_in_kilowatts,
-                      'active_power_demand_in_kilowatts': active_power_demand_in_kilowatts}
-        elif number_of_storage_assets > 0 and number_of_buildings == 0:
-            output = {'buses_voltage_in_per_unit': buses_voltage_in_per_unit,
-                      'buses_voltage_angle_in_degrees': buses_voltage_angle_in_degrees,
-                      'buses_active_power_in_kilowatts': buses_active_power_in_kilowatts,
-                      'buses_reactive_power_in_kilovolt_ampere_reactive':
-                          buses_reactive_power_in_kilovolt_ampere_reactive,
-                      'market_active_power_in_kilowatts': market_active_power_in_kilowatts,
-                      'market_reactive_power_in_kilovolt_ampere_reactive':
-                          market_reactive_power_in_kilovolt_ampere_reactive,
-                      'storage_asset_charge_or_discharge_power_in_kilowatts':
-                          storage_asset_charge_or_discharge_power_in_kilowatts,
-                      'imported_active_power_in_kilowatts': imported_active_power_in_kilowatts,
-                      'exported_active_power_in_kilowatts': exported_active_power_in_kilowatts,
-                      'active_power_demand_in_kilowatts': active_power_demand_in_kilowatts}
-        else:
-            raise ValueError('No dispatchable assets.')
+        output = {'buses_voltage_in_per_unit': buses_voltage_in_per_unit,
+                  'buses_voltage_angle_in_degrees': buses_voltage_angle_in_degrees,
+                  'buses_active_power_in_kilowatts': buses_active_power_in_kilowatts,
+                  'buses_reactive_power_in_kilovolt_ampere_reactive': buses_reactive_power_in_kilovolt_ampere_reactive,
+                  'market_active_power_in_kilowatts': market_active_power_in_kilowatts,
+                  'market_reactive_power_in_kilovolt_ampere_reactive':
+                      market_reactive_power_in_kilovolt_ampere_reactive,
+                  'imported_active_power_in_kilowatts': imported_active_power_in_kilowatts,
+                  'exported_active_power_in_kilowatts': exported_active_power_in_kilowatts,
+                  'active_power_demand_in_kilowatts': active_power_demand_in_kilowatts}
+        if number_of_storage_assets > 0:
+            output['storage_asset_charge_or_discharge_power_in_kilowatts'] = \
+                storage_asset_charge_or_discharge_power_in_kilowatts
+            output['storage_asset_accumulated_power_in_kilowatts'] = storage_asset_accumulated_power_in_kilowatts
+        if number_of_buildings > 0:
+            output['building_power_consumption_in_kilowatts'] = building_power_consumption_in_kilowatts
 
         return output
 
+    @staticmethod
+    def _run_newton_raphson_power_flow(network: pp.pandapowerNet, load_indexes: np.ndarray,
+                                       number_of_time_interval_per_day: int,
+                                       active_power_bus_demand_in_kilowatts: np.ndarray,
+                                       reactive_power_bus_demand_in_kilovolt_ampere_reactive: np.ndarray,
+                                       network_simulation_results: np.ndarray):
+        # add the P,Q loads of the simulation interval number_of_time_interval_per_day to the network
+        network.load.loc[load_indexes, 'p_mw'] = \
+            active_power_bus_demand_in_kilowatts[number_of_time_interval_per_day] / 1e3
+        network.load.loc[load_indexes, 'q_mvar'] = \
+            reactive_power_bus_demand_in_kilovolt_ampere_reactive[number_of_time_interval_per_day] / 1e3
+        # run the power flow simulation (the C++ lightsim2grid Newton-Raphson is only requested when it is installed,
+        # otherwise pandapower runs its numba-accelerated solver). Every solve after the first one starts
+        # from the voltages of the previous solve, unless some bus has no result (out of service or isolated buses),
+        # since starting from those voltages can converge to a spurious low voltage solution
+        max_iteration = 100
+        initialization = 'results' if network.converged and not network.res_bus['vm_pu'].isna().any() else 'auto'
+        pp.runpp(net=network, max_iteration=max_iteration, init=initialization, numba=True,
+                 lightsim2grid=IS_LIGHTSIM2GRID_INSTALLED)  # or “nr”
+
+        market_results = network.res_ext_grid[['p_mw', 'q_mvar']].to_numpy()[0]
+        network_simulation_results['market_active_power_in_kilowatts'][number_of_time_interval_per_day] = \
+            market_results[0] * 1e3
+        network_simulation_results['market_reactive_power_in_kilovolt_ampere_reactive'][
+            number_of_time_interval_per_day] = market_results[1] * 1e3
+        buses_results = network.res_bus[['vm_pu', 'va_degree', 'p_mw', 'q_mvar']].to_numpy()
+        network_simulation_results['buses_voltage_in_per_unit'][number_of_time_interval_per_day] = \
+            buses_results[:, 0]
+        network_simulation_results['buses_voltage_angle_in_degrees'][number_of_time_interval_per_day] = \
+            buses_results[:, 1]
+        network_simulation_results['buses_active_power_in_kilowatts'][number_of_time_interval_per_day] = \
+            buses_results[:, 2] * 1e3
+        network_simulation_results['buses_reactive_power_in_kilovolt_ampere_reactive'][
+            number_of_time_interval_per_day] = buses_results[:, 3] * 1e3
+
+    @staticmethod
+    def _run_batched_power_flow(network: pp.pandapowerNet, power_flow_model: dict,
+                                active_power_bus_demand_in_kilowatts: np.ndarray,
+                                reactive_power_bus_demand_in_kilovolt_ampere_reactive: np.ndarray,
+                                network_simulation_results: np.ndarray) -> np.ndarray:
+        """
+        Solve the power flows of all the simulation intervals with the admittance matrix, bus power injections and
+        voltages of the pandapower power flow model of the first interval. Only the results of the converged
+        intervals are written and the mask of converged intervals is returned.
+        """
+        bus_lookup = network._pd2ppc_lookups['bus'][network.bus.index.to_numpy()]
+        base_in_kilovolt_ampere = power_flow_model['baseMVA'] * 1e3
+        admittance_matrix = power_flow_model['Ybus']
+        # the bus power injections of the first interval are shifted by the change of the bus demands
+        bus_demand_in_per_unit = np.zeros([admittance_matrix.shape[0], active_power_bus_demand_in_kilowatts.shape[0]],
+                                          dtype=complex)
+        np.add.at(bus_demand_in_per_unit, bus_lookup,
+                  (active_power_bus_demand_in_kilowatts + 1j * reactive_power_bus_demand_in_kilovolt_ampere_reactive).T
+                  / base_in_kilovolt_ampere)
+        bus_power_injections = power_flow_model['Sbus'].reshape(-1, 1) + bus_demand_in_per_unit[:, [0]] - \
+            bus_demand_in_per_unit
+        voltages, is_converged = run_batched_z_bus_power_flow(
+            admittance_matrix=admittance_matrix, bus_power_injections=bus_power_injections,
+            slack_bus_indexes=power_flow_model['ref'], initial_voltages=power_flow_model['V'],
+            tolerance=1e-8 / power_flow_model['baseMVA'])
+
+        buses_voltages = voltages[bus_lookup].T[is_converged]
+        buses_power_in_kilovolt_ampere = \
+            -(voltages * np.conj(admittance_matrix @ voltages))[bus_lookup].T[is_converged] * base_in_kilovolt_ampere
+        converged_results = network_simulation_results[is_converged]
+        converged_results['buses_voltage_in_per_unit'] = np.abs(buses_voltages)
+        converged_results['buses_voltage_angle_in_degrees'] = np.degrees(np.angle(buses_voltages))
+        converged_results['buses_active_power_in_kilowatts'] = buses_power_in_kilovolt_ampere.real
+        converged_results['buses_reactive_power_in_kilovolt_ampere_reactive'] = buses_power_in_kilovolt_ampere.imag
+        # the external grid supplies the demand at its bus minus the bus result, which follows the load convention
+        external_grid_bus = network.ext_grid['bus'].iloc[0]
+        converged_results['market_active_power_in_kilowatts'] = \
+            active_power_bus_demand_in_kilowatts[is_converged, external_grid_bus] - \
+            converged_results['buses_active_power_in_kilowatts'][:, external_grid_bus]
+        converged_results['market_reactive_power_in_kilovolt_ampere_reactive'] = \
+            reactive_power_bus_demand_in_kilovolt_ampere_reactive[is_converged, external_grid_bus] - \
+            converged_results['buses_reactive_power_in_kilovolt_ampere_reactive'][:, external_grid_bus]
+        network_simulation_results[is_converged] = converged_results
+        return is_converged
+
     def _get_asset_active_power_in_kilowatts(self, number_of_assets: int,
                                              active_power_in_kilowatts):
-        initial_active_power_in_kilowatts = np.zeros([self.number_of_time_intervals_per_day,
-                                                      number_of_assets])
-        for t in range(self.number_of_time_intervals_per_day):
-            t_ems = int(t / (
-                    self.energy_management_system_time_series_resolution_in_hours /
-                    self.simulation_time_series_resolution_in_hours))
-            initial_active_power_in_kilowatts[t, :] = \
-                active_power_in_kilowatts[t_ems, :]
-        return initial_active_power_in_kilowatts
+        # every energy management system time interval is held over the simulation time intervals it spans
+        return np.repeat(np.asarray(active_power_in_kilowatts, dtype=float).reshape(-1, number_of_assets),
+                         self.number_of_time_intervals_per_energy_management_system_time_interval, axis=0)
 
     def add_linear_building_thermal_model_constraints_to_the_problem(
-            self, number_of_buildings: int, problem: pic.Problem, heating_active_power_in_kilowatts: float,
-            cooling_active_power_in_kilowatts: float, building_internal_temperature_in_celsius_degrees: float,
-            controllable_assets_active_power_in_kilowatts: float):
-
-        # linear building thermal model constraints
+            self, number_of_buildings: int, problem: LinearProgram, heating_active_power_in_kilowatts: int,
+            cooling_active_power_in_kilowatts: int, building_internal_temperature_in_celsius_degrees: int,
+            controllable_assets_active_power_in_kilowatts: int):
+
+        # linear building thermal model constraints (the heating, cooling and inside temperature limits are the
+        # bounds of their variables)
+        number_of_energy_management_system_time_intervals_per_day = \
+            self.number_of_energy_management_system_time_intervals_per_day
         for number_of_building in range(number_of_buildings):
-            max_heating_power_constraint_in_kilowatts = \
-                heating_active_power_in_kilowatts[:, number_of_building] <= \
-                self.building_assets[number_of_building].max_consumed_electric_heating_kilowatts
-            problem.add_constraint(max_heating_power_constraint_in_kilowatts)
-            max_cooling_power_constraint_in_kilowatts = \
-                cooling_active_power_in_kilowatts[:, number_of_building] <= \
-                self.building_assets[number_of_building].max_consumed_electric_cooling_kilowatts
-            problem.add_constraint(max_cooling_power_constraint_in_kilowatts)
-
-            max_inside_degree_celsius_constraint = \
-                building_internal_temperature_in_celsius_degrees[:, number_of_building] <= \
-                self.building_assets[number_of_building].max_inside_degree_celsius
-            problem.add_constraint(max_inside_degree_celsius_constraint)
-            min_inside_degree_celsius_constraint = \
-                building_internal_temperature_in_celsius_degrees[:, number_of_building] >= \
-                self.building_assets[number_of_building].min_inside_degree_celsius
-            problem.add_constraint(min_inside_degree_celsius_constraint)
+            first_time_interval_of_the_building = \
+                number_of_building * number_of_energy_management_system_time_intervals_per_day
             # power consumption is the sum of heating and cooling
-            cooling_and_heating_active_power_in_kilowatts = \
-                cooling_active_power_in_kilowatts[:, number_of_building] + \
-                heating_active_power_in_kilowatts[:, number_of_building]
             cooling_and_heating_active_power_constraint_in_kilowatts = \
-                controllable_assets_active_power_in_kilowatts[:, number_of_building] == \
-                cooling_and_heating_active_power_in_kilowatts
-            problem.add_constraint(cooling_and_heating_active_power_constraint_in_kilowatts)
+                problem.get_variable_selection_matrix(
+                    first_variable_index=
+                    controllable_assets_active_power_in_kilowatts + first_time_interval_of_the_building,
+                    number_of_selected_variables=number_of_energy_management_system_time_intervals_per_day) - \
+                problem.get_variable_selection_matrix(
+                    first_variable_index=cooling_active_power_in_kilowatts + first_time_interval_of_the_building,
+                    number_of_selected_variables=number_of_energy_management_system_time_intervals_per_day) - \
+                problem.get_variable_selection_matrix(
+                    first_variable_index=heating_active_power_in_kilowatts + first_time_interval_of_the_building,
+                    number_of_selected_variables=number_of_energy_management_system_time_intervals_per_day)
+            problem.add_equality_constraints(coefficients=cooling_and_heating_active_power_constraint_in_kilowatts,
+                                             right_hand_side=0)
 
             self.add_temperature_constraints_to_problem(number_of_building=number_of_building, problem=problem,
                                                         building_internal_temperature_in_celsius_degrees=
@@ -530,105 +566,135 @@ class EnergySystem:
                                                         heating_active_power_in_kilowatts=
                                                         heating_active_power_in_kilowatts)
 
-    def add_temperature_constraints_to_problem(self, number_of_building: int, problem: pic.Problem,
-                                               building_internal_temperature_in_celsius_degrees: float,
-                                               cooling_active_power_in_kilowatts: float,
-                                               heating_active_power_in_kilowatts: float):
-
-        alpha = self.building_assets[number_of_building].alpha
-        beta = self.building_assets[number_of_building].beta
-        gamma = self.building_assets[number_of_building].gamma
-
-        for energy_management_system_time_interval_per_day in range(
-                self.number_of_energy_management_system_time_intervals_per_day):
-            if energy_management_system_time_interval_per_day == 0:
-                # initial temperature constraint
-                initial_inside_degree_celsius_constraint = \
-                    building_internal_temperature_in_celsius_degrees[
-                        energy_management_system_time_interval_per_day, number_of_building] == \
-                    self.building_assets[number_of_building].initial_inside_degree_celsius
-                problem.add_constraint(initial_inside_degree_celsius_constraint)
-            else:
-                # Inside temperature is a function of heating/cooling and
-                # outside temperature. Alpha, beta and gamma are parameters
-                # derived from the R and C values of the building.
-                previous_building_internal_temperature_in_celsius_degrees = \
-                    building_internal_temperature_in_celsius_degrees[
-                        energy_management_system_time_interval_per_day - 1, number_of_building]
-                chiller_coefficient_of_performance = \
-                    self.building_assets[number_of_building].chiller_coefficient_of_performance
-                previous_cooling_active_power_in_kilowatts = \
-                    cooling_active_power_in_kilowatts[
-                        energy_management_system_time_interval_per_day - 1, number_of_building]
-                heat_pump_coefficient_of_performance = \
-                    self.building_assets[number_of_building].heat_pump_coefficient_of_performance
-                previous_heating_active_power_in_kilowatts = \
-                    heating_active_power_in_kilowatts[
-                        energy_management_system_time_interval_per_day - 1, number_of_building]
-                previous_ambient_temperature_in_degree_celsius = \
-                    self.building_assets[number_of_building].ambient_temperature_in_degree_celsius[
-                        energy_management_system_time_interval_per_day - 1]
-                temperature_constraint = \
-                    get_temperature_constraint_for_no_initial_time(
-                        alpha=alpha, beta=beta, gamma=gamma,
-                        previous_building_internal_temperature_in_celsius_degrees=
-                        previous_building_internal_temperature_in_celsius_degrees,
-                        chiller_coefficient_of_performance=chiller_coefficient_of_performance,
-                        previous_cooling_active_power_in_kilowatts=previous_cooling_active_power_in_kilowatts,
-                        heat_pump_coefficient_of_performance=heat_pump_coefficient_of_performance,
-                        previous_heating_active_power_in_kilowatts=previous_heating_active_power_in_kilowatts,
-                        previous_ambient_temperature_in_degree_celsius=
-                        previous_ambient_temperature_in_degree_celsius)
-
-                problem.add_constraint(
-                    building_internal_temperature_in_celsius_degrees[
-                        energy_management_system_time_interval_per_day,
-                        number_of_building] == temperature_constraint)
+    def add_temperature_constraints_to_problem(self, number_of_building: int, problem: LinearProgram,
+                                               building_internal_temperature_in_celsius_degrees: int,
+                                               cooling_active_power_in_kilowatts: int,
+                                               heating_active_power_in_kilowatts: int):
+
+        building_asset = self.building_assets[number_of_building]
+        alpha = building_asset.alpha
+        beta = building_asset.beta
+        gamma = building_asset.gamma
+
+        number_of_energy_management_system_time_intervals_per_day = \
+            self.number_of_energy_management_system_time_intervals_per_day
+        first_time_interval_of_the_building = \
+            number_of_building * number_of_energy_management_system_time_intervals_per_day
+        building_internal_temperature_index = \
+            building_internal_temperature_in_celsius_degrees + first_time_interval_of_the_building
+        cooling_active_power_index = cooling_active_power_in_kilowatts + first_time_interval_of_the_building
+        heating_active_power_index = heating_active_power_in_kilowatts + first_time_interval_of_the_building
+
+        # initial temperature constraint
+        initial_inside_degree_celsius_constraint = problem.get_variable_selection_matrix(
+            first_variable_index=building_internal_temperature_index, number_of_selected_variables=1)
+        problem.add_equality_constraints(coefficients=initial_inside_degree_celsius_constraint,
+                                         right_hand_side=building_asset.initial_inside_degree_celsius)
+
+        # Inside temperature is a function of heating/cooling and
+        # outside temperature. Alpha, beta and gamma are parameters
+        # derived from the R and C values of the building. For every time interval t but the first one:
+        # T[t] - alpha * T[t - 1] + beta * COP_chiller * P_cooling[t - 1] - beta * COP_heat_pump * P_heating[t - 1]
+        # = gamma * T_ambient[t - 1]
+        number_of_time_intervals_after_the_first = number_of_energy_management_system_time_intervals_per_day - 1
+        temperature_constraint = \
+            problem.get_variable_selection_matrix(
+                first_variable_index=building_internal_temperature_index + 1,
+                number_of_selected_variables=number_of_time_intervals_after_the_first) - \
+            alpha * problem.get_variable_selection_matrix(
+                first_variable_index=building_internal_temperature_index,
+                number_of_selected_variables=number_of_time_intervals_after_the_first) + \
+            beta * building_asset.chiller_coefficient_of_performance * problem.get_variable_selection_matrix(
+                first_variable_index=cooling_active_power_index,
+                number_of_selected_variables=number_of_time_intervals_after_the_first) - \
+            beta * building_asset.heat_pump_coefficient_of_performance * problem.get_variable_selection_matrix(
+                first_variable_index=heating_active_power_index,
+                number_of_selected_variables=number_of_time_intervals_after_the_first)
+        problem.add_equality_constraints(
+            coefficients=temperature_constraint,
+            right_hand_side=gamma * building_asset.ambient_temperature_in_degree_celsius[:-1])
 
     def add_linear_battery_model_constraints_to_the_problem(
-            self, number_of_storage_assets: int, problem: pic.Problem,
-            controllable_assets_active_power_in_kilowatts: float, number_of_buildings: int, asum: pic.Constant):
-
-        # linear battery model constraints
-        for number_of_storage_asset in range(number_of_storage_assets):
-            battery_max_power_constraint_in_kilowatts = \
-                controllable_assets_active_power_in_kilowatts[:, number_of_buildings + number_of_storage_asset] \
-                <= float(self.storage_assets[number_of_storage_asset].max_active_power_in_kilowatts[0])
-            problem.add_constraint(battery_max_power_constraint_in_kilowatts)
-            battery_min_power_constraint_in_kilowatts = \
-                controllable_assets_active_power_in_kilowatts[:, number_of_buildings + number_of_storage_asset] \
-                >= float(self.storage_assets[number_of_storage_asset].min_active_power_in_kilowatts[0])
-            problem.add_constraint(battery_min_power_constraint_in_kilowatts)
-            # maximum energy constraint
-            battery_max_energy_constraint_in_kilowatt_hour = \
-                self.energy_management_system_time_series_resolution_in_hours * asum * \
-                controllable_assets_active_power_in_kilowatts[:, number_of_buildings + number_of_storage_asset] <= \
-                float(self.storage_assets[number_of_storage_asset].max_active_power_in_kilowatts[0]) - \
-                self.storage_assets[number_of_storage_asset].initial_energy_level_in_kilowatt_hour
-            problem.add_constraint(battery_max_energy_constraint_in_kilowatt_hour)
-
-            battery_min_energy_constraint_in_kilowatt_hour = \
-                self.energy_management_system_time_series_resolution_in_hours * asum * \
-                controllable_assets_active_power_in_kilowatts[:, number_of_buildings + number_of_storage_asset] >= \
-                float(self.storage_assets[number_of_storage_asset].min_energy_in_kilowatt_hour[0]) - \
-                self.storage_assets[number_of_storage_asset].initial_energy_level_in_kilowatt_hour
-            problem.add_constraint(battery_min_energy_constraint_in_kilowatt_hour)
-
-            final_energy_constraint = \
-                self.energy_management_system_time_series_resolution_in_hours * \
-                asum[self.number_of_energy_management_system_time_intervals_per_day - 1, :] * \
-                controllable_assets_active_power_in_kilowatts[:, number_of_buildings + number_of_storage_asset] == \
-                self.storage_assets[number_of_storage_asset].required_terminal_energy_level_in_kilowatt_hour - \
-                self.storage_assets[number_of_storage_asset].initial_energy_level_in_kilowatt_hour
-            problem.add_constraint(final_energy_constraint)
+            self, number_of_storage_assets: int, problem: LinearProgram,
+            controllable_assets_active_power_in_kilowatts: int, number_of_buildings: int,
+            storage_assets_energy_change_in_kilowatt_hour: int):
+
+        number_of_energy_management_system_time_intervals_per_day = \
+            self.number_of_energy_management_system_time_intervals_per_day
+        # linear battery model constraints, for all the storage assets at once (their variables are stored one
+        # asset after the other)
+        if number_of_storage_assets == 0:
+            return
+        storage_assets_active_power_index = \
+            controllable_assets_active_power_in_kilowatts + \
+            number_of_buildings * number_of_energy_management_system_time_intervals_per_day
+        # the storage asset parameters are gathered once and shared by all the constraints below
+        storage_assets = self.storage_assets
+        min_active_powers_in_kilowatts = np.array([float(storage_asset.min_active_power_in_kilowatts[0])
+                                                   for storage_asset in storage_assets])
+        max_active_powers_in_kilowatts = np.array([float(storage_asset.max_active_power_in_kilowatts[0])
+                                                   for storage_asset in storage_assets])
+        min_energies_in_kilowatt_hour = np.array([float(storage_asset.min_energy_in_kilowatt_hour[0])
+                                                  for storage_asset in storage_assets])
+        initial_energy_levels_in_kilowatt_hour = np.array([storage_asset.initial_energy_level_in_kilowatt_hour
+                                                           for storage_asset in storage_assets])
+        required_terminal_energy_levels_in_kilowatt_hour = np.array(
+            [storage_asset.required_terminal_energy_level_in_kilowatt_hour for storage_asset in storage_assets])
+        # the controllable asset powers are non-negative, so the minimum power only tightens a positive bound
+        problem.set_variable_bounds(
+            variable_indexes=np.arange(storage_assets_active_power_index,
+                                       storage_assets_active_power_index +
+                                       number_of_storage_assets * number_of_energy_management_system_time_intervals_per_day),
+            lower=np.repeat(np.maximum(0., min_active_powers_in_kilowatts),
+                            number_of_energy_management_system_time_intervals_per_day),
+            upper=np.repeat(max_active_powers_in_kilowatts,
+                            number_of_energy_management_system_time_intervals_per_day))
+        # energy change recursion, E[t] - E[t - 1] = dt * P[t] with E[-1] = 0
+        energy_change_difference = sparse.eye(number_of_energy_management_system_time_intervals_per_day) - \
+            sparse.eye(number_of_energy_management_system_time_intervals_per_day, k=-1)
+        storage_assets_energy_change_constraint = \
+            sparse.kron(sparse.eye(number_of_storage_assets), energy_change_difference, format='csr') @ \
+            problem.get_variable_selection_matrix(
+                first_variable_index=storage_assets_energy_change_in_kilowatt_hour,
+                number_of_selected_variables=
+                number_of_storage_assets * number_of_energy_management_system_time_intervals_per_day) - \
+            self.energy_management_system_time_series_resolution_in_hours * \
+            problem.get_variable_selection_matrix(
+                first_variable_index=storage_assets_active_power_index,
+                number_of_selected_variables=
+                number_of_storage_assets * number_of_energy_management_system_time_intervals_per_day)
+        problem.add_equality_constraints(coefficients=storage_assets_energy_change_constraint, right_hand_side=0)
+        storage_assets_energy_change_in_kilowatt_hour = problem.get_variable_selection_matrix(
+            first_variable_index=storage_assets_energy_change_in_kilowatt_hour,
+            number_of_selected_variables=
+            number_of_storage_assets * number_of_energy_management_system_time_intervals_per_day)
+        # maximum energy constraint
+        problem.add_inequality_constraints(
+            coefficients=storage_assets_energy_change_in_kilowatt_hour,
+            right_hand_side=np.repeat(max_active_powers_in_kilowatts - initial_energy_levels_in_kilowatt_hour,
+                                      number_of_energy_management_system_time_intervals_per_day))
+        # minimum energy constraint
+        problem.add_inequality_constraints(
+            coefficients=-storage_assets_energy_change_in_kilowatt_hour,
+            right_hand_side=-np.repeat(min_energies_in_kilowatt_hour - initial_energy_levels_in_kilowatt_hour,
+                                       number_of_energy_management_system_time_intervals_per_day))
+
+        final_energy_constraint = storage_assets_energy_change_in_kilowatt_hour[
+                                  number_of_energy_management_system_time_intervals_per_day - 1::
+                                  number_of_energy_management_system_time_intervals_per_day]
+        problem.add_equality_constraints(
+            coefficients=final_energy_constraint,
+            right_hand_side=required_terminal_energy_levels_in_kilowatt_hour - initial_energy_levels_in_kilowatt_hour)
 
     def add_import_and_export_constraints_to_the_problem(
-            self, problem: pic.Problem, controllable_assets_active_power_in_kilowatts: float,
-            resampled_non_dispatchable_assets_active_power_in_kilowatts: float,
-            active_power_imports_in_kilowatts: float,
-            active_power_exports_in_kilowatts: float, max_active_power_demand_in_kilowatts: float,
+            self, problem: LinearProgram, controllable_assets_active_power_in_kilowatts: int,
+            number_of_dispatchable_assets: int, resampled_non_dispatchable_assets_active_power_in_kilowatts: np.ndarray,
+            active_power_imports_in_kilowatts: int,
+            active_power_exports_in_kilowatts: int, max_active_power_demand_in_kilowatts: int,
             blackout_start_time_in_hours: float, blackout_stop_time_in_hours: float):
 
+        number_of_energy_management_system_time_intervals_per_day = \
+            self.number_of_energy_management_system_time_intervals_per_day
         blackout_step_in_minutes = int(self.energy_management_system_time_series_resolution_in_hours * 60)
         blackout_range = get_range_array_from_between_hours(start_time_in_hours=blackout_start_time_in_hours,
                                                             stop_time_in_hours=blackout_stop_time_in_hours,
@@ -636,109 +702,91 @@ class EnergySystem:
         if blackout_range.size != 0:
             blackout_start = blackout_range.min()
             blackout_end = blackout_range.max()
-
-            for number_of_energy_management_system_time_interval_per_day in range(0, blackout_start):
-                power_balance_constraint = sum(controllable_assets_active_power_in_kilowatts[
-                                               number_of_energy_management_system_time_interval_per_day, :]) + \
-                                           resampled_non_dispatchable_assets_active_power_in_kilowatts[
-                                               number_of_energy_management_system_time_interval_per_day] == \
-                                           active_power_imports_in_kilowatts[
-                                               number_of_energy_management_system_time_interval_per_day] - \
-                                           active_power_exports_in_kilowatts[
-                                               number_of_energy_management_system_time_interval_per_day]
-                problem.add_constraint(power_balance_constraint)
-                # maximum demand dummy variable constraint
-                dummy_constraint = \
-                    max_active_power_demand_in_kilowatts >= active_power_imports_in_kilowatts[
-                        number_of_energy_management_system_time_interval_per_day] - \
-                    active_power_exports_in_kilowatts[number_of_energy_management_system_time_interval_per_day]
-                problem.add_constraint(dummy_constraint)
-                # Blackout
-            for number_of_energy_management_system_time_interval_per_day in blackout_range:
-                problem.add_constraint(controllable_assets_active_power_in_kilowatts[
-                                           number_of_energy_management_system_time_interval_per_day] == 0)
-                problem.add_constraint(active_power_imports_in_kilowatts[
-                                           number_of_energy_management_system_time_interval_per_day] == 0)
-                problem.add_constraint(active_power_exports_in_kilowatts[
-                                           number_of_energy_management_system_time_interval_per_day] == 0)
-            for number_of_energy_management_system_time_interval_per_day in range(
-                    blackout_end, self.number_of_energy_management_system_time_intervals_per_day):
-                power_balance_constraint = sum(controllable_assets_active_power_in_kilowatts[
-                                               number_of_energy_management_system_time_interval_per_day, :]) + \
-                                           resampled_non_dispatchable_assets_active_power_in_kilowatts[
-                                               number_of_energy_management_system_time_interval_per_day] == \
-                                           active_power_imports_in_kilowatts[
-                                               number_of_energy_management_system_time_interval_per_day] - \
-                                           active_power_exports_in_kilowatts[
-                                               number_of_energy_management_system_time_interval_per_day]
-                problem.add_constraint(power_balance_constraint)
-                # maximum demand dummy variable constraint
-                dummy_constraint = \
-                    max_active_power_demand_in_kilowatts >= active_power_imports_in_kilowatts[
-                        number_of_energy_management_system_time_interval_per_day] - \
-                    active_power_exports_in_kilowatts[number_of_energy_management_system_time_interval_per_day]
-                problem.add_constraint(dummy_constraint)
+            power_balance_time_intervals = np.concatenate([
+                np.arange(0, blackout_start),
+                np.arange(blackout_end, number_of_energy_management_system_time_intervals_per_day)])
+            # Blackout (only the first controllable asset, the building when there is one, is switched off)
+            blackout_variable_indexes = np.concatenate([controllable_assets_active_power_in_kilowatts + blackout_range,
+                                                        active_power_imports_in_kilowatts + blackout_range,
+                                                        active_power_exports_in_kilowatts + blackout_range])
+            problem.set_variable_bounds(variable_indexes=blackout_variable_indexes, lower=0, upper=0)
         else:
-            for number_of_energy_management_system_time_interval_per_day in range(
-                    self.number_of_energy_management_system_time_intervals_per_day):
-                power_balance_constraint = sum(controllable_assets_active_power_in_kilowatts[
-                                               number_of_energy_management_system_time_interval_per_day, :]) + \
-                                           resampled_non_dispatchable_assets_active_power_in_kilowatts[
-                                               number_of_energy_management_system_time_interval_per_day] == \
-                                           active_power_imports_in_kilowatts[
-                                               number_of_energy_management_system_time_interval_per_day] - \
-                                           active_power_exports_in_kilowatts[
-                                               number_of_energy_management_system_time_interval_per_day]
-                problem.add_constraint(power_balance_constraint)
-                # maximum demand dummy variable constraint
-                dummy_constraint = \
-                    max_active_power_demand_in_kilowatts >= active_power_imports_in_kilowatts[
-                        number_of_energy_management_system_time_interval_per_day] - \
-                    active_power_exports_in_kilowatts[number_of_energy_management_system_time_interval_per_day]
-                problem.add_constraint(dummy_constraint)
+            power_balance_time_intervals = np.arange(number_of_energy_management_system_time_intervals_per_day)
+
+        power_balance_time_interval_selection = \
+            sparse.eye(number_of_energy_management_system_time_intervals_per_day,
+                       format='csr')[power_balance_time_intervals]
+        controllable_assets_total_active_power_in_kilowatts = sum(
+            problem.get_variable_selection_matrix(
+                first_variable_index=controllable_assets_active_power_in_kilowatts +
+                                     number_of_dispatchable_asset *
+                                     number_of_energy_management_system_time_intervals_per_day,
+                number_of_selected_variables=number_of_energy_management_system_time_intervals_per_day)
+            for number_of_dispatchable_asset in range(number_of_dispatchable_assets))
+        net_imported_active_power_in_kilowatts = \
+            problem.get_variable_selection_matrix(
+                first_variable_index=active_power_imports_in_kilowatts,
+                number_of_selected_variables=number_of_energy_management_system_time_intervals_per_day) - \
+            problem.get_variable_selection_matrix(
+                first_variable_index=active_power_exports_in_kilowatts,
+                number_of_selected_variables=number_of_energy_management_system_time_intervals_per_day)
+
+        power_balance_constraint = power_balance_time_interval_selection @ \
+                                   (controllable_assets_total_active_power_in_kilowatts -
+                                    net_imported_active_power_in_kilowatts)
+        problem.add_equality_constraints(
+            coefficients=power_balance_constraint,
+            right_hand_side=-resampled_non_dispatchable_assets_active_power_in_kilowatts[power_balance_time_intervals])
+        # maximum demand dummy variable constraint
+        dummy_constraint = \
+            power_balance_time_interval_selection @ net_imported_active_power_in_kilowatts - \
+            sparse.csr_matrix(np.ones([power_balance_time_intervals.size, 1])) @ \
+            problem.get_variable_selection_matrix(first_variable_index=max_active_power_demand_in_kilowatts,
+                                                  number_of_selected_variables=1)
+        problem.add_inequality_constraints(coefficients=dummy_constraint, right_hand_side=0)
 
     def add_frequency_response_constraints_to_the_problem(
-            self, number_of_storage_assets: int, problem: pic.Problem, asum: pic.Constant,
-            controllable_assets_active_power_in_kilowatts: float, number_of_buildings: int):
+            self, number_of_storage_assets: int, problem: LinearProgram,
+            storage_assets_energy_change_in_kilowatt_hour: int):
 
         if self.market.frequency_response_active is not None:
             frequency_response_window = self.market.frequency_response_active
             max_state_of_charge_for_frequency_response = self.market.max_frequency_response_state_of_charge
             min_state_of_charge_for_frequency_response = self.market.min_frequency_response_state_of_charge
 
-            for energy_management_system_time_interval_per_day in range(
-                    self.number_of_energy_management_system_time_intervals_per_day):
-                if frequency_response_window:
-                    self.get_final_energy_constraints(
-                        number_of_storage_assets=number_of_storage_assets, problem=problem, asum=asum,
-                        energy_management_system_time_interval_per_day=energy_management_system_time_interval_per_day,
-                        controllable_assets_active_power_in_kilowatts=controllable_assets_active_power_in_kilowatts,
-                        number_of_buildings=number_of_buildings,
-                        max_state_of_charge_for_frequency_response=max_state_of_charge_for_frequency_response,
-                        min_state_of_charge_for_frequency_response=min_state_of_charge_for_frequency_response)
+            if frequency_response_window:
+                self.get_final_energy_constraints(
+                    number_of_storage_assets=number_of_storage_assets, problem=problem,
+                    storage_assets_energy_change_in_kilowatt_hour=storage_assets_energy_change_in_kilowatt_hour,
+                    max_state_of_charge_for_frequency_response=max_state_of_charge_for_frequency_response,
+                    min_state_of_charge_for_frequency_response=min_state_of_charge_for_frequency_response)
 
     def get_final_energy_constraints(
-            self, number_of_storage_assets: int, problem: pic.Problem, asum: pic.Constant,
-            energy_management_system_time_interval_per_day, controllable_assets_active_power_in_kilowatts: float,
-            number_of_buildings: int, max_state_of_charge_for_frequency_response: float,
-            min_state_of_charge_for_frequency_response: float):
-
-        for number_of_storage_asset in range(number_of_storage_assets):
-            # final energy constraint
-            final_energy_constraint_1 = \
-                self.energy_management_system_time_series_resolution_in_hours * \
-                asum[energy_management_system_time_interval_per_day, :] * \
-                controllable_assets_active_power_in_kilowatts[:, number_of_buildings + number_of_storage_asset] <= \
-                (max_state_of_charge_for_frequency_response *
-                 self.storage_assets[number_of_storage_asset].max_energy_in_kilowatt_hour) - \
-                self.storage_assets[number_of_storage_asset].initial_energy_level_in_kilowatt_hour
-            problem.add_constraint(final_energy_constraint_1)
-
-            final_energy_constraint_2 = \
-                self.energy_management_system_time_series_resolution_in_hours * \
-                asum[energy_management_system_time_interval_per_day, :] * \
-                controllable_assets_active_power_in_kilowatts[:, number_of_buildings + number_of_storage_asset] >= \
-                (min_state_of_charge_for_frequency_response *
-                 self.storage_assets[number_of_storage_asset].max_energy_in_kilowatt_hour) - \
-                self.storage_assets[number_of_storage_asset].initial_energy_level_in_kilowatt_hour
-            problem.add_constraint(final_energy_constraint_2)
+            self, number_of_storage_assets: int, problem: LinearProgram,
+            storage_assets_energy_change_in_kilowatt_hour: int,
+            max_state_of_charge_for_frequency_response: float, min_state_of_charge_for_frequency_response: float):
+
+        if number_of_storage_assets == 0:
+            return
+        number_of_energy_management_system_time_intervals_per_day = \
+            self.number_of_energy_management_system_time_intervals_per_day
+        storage_assets_energy_change_in_kilowatt_hour = problem.get_variable_selection_matrix(
+            first_variable_index=storage_assets_energy_change_in_kilowatt_hour,
+            number_of_selected_variables=
+            number_of_storage_assets * number_of_energy_management_system_time_intervals_per_day)
+        # final energy constraint (every value of the energy limit time series applies to each time interval,
+        # so the tightest one is kept)
+        problem.add_inequality_constraints(
+            coefficients=storage_assets_energy_change_in_kilowatt_hour,
+            right_hand_side=np.repeat([np.min(max_state_of_charge_for_frequency_response *
+                                              storage_asset.max_energy_in_kilowatt_hour -
+                                              storage_asset.initial_energy_level_in_kilowatt_hour)
+                                       for storage_asset in self.storage_assets],
+                                      number_of_energy_management_system_time_intervals_per_day))
+        problem.add_inequality_constraints(
+            coefficients=-storage_assets_energy_change_in_kilowatt_hour,
+            right_hand_side=-np.repeat([np.max(min_state_of_charge_for_frequency_response *
+                                               storage_asset.max_energy_in_kilowatt_hour -
+                                               storage_asset.initial_energy_level_in_kilowatt_hour)
+                                        for storage_asset in self.storage_assets],
+                                       number_of_energy_management_system_time_intervals_per_day))
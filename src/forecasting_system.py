@@ -69,8 +69,8 @@ class ForecastingSystem:
                               self.EndTimePi,self.UTC,self.lat,self.long,self.alt,\
                               self.ppeak,self.tilt,self.azimuth,self.eff,self.No_modules, \
                               self.Amodule,self.WF_Dir,self.WF_Dir_raw,self.M_Dir,self.plot_opt,nargout=2) # Process forecast
-        prob=pd.DataFrame(np.matrix(prob)) # Convert the output to a dataframe
-        det=pd.DataFrame(np.matrix(det))   # Convert the output to a dataframe
+        prob=pd.DataFrame(np.atleast_2d(np.asarray(prob))) # Convert the output to a dataframe
+        det=pd.DataFrame(np.atleast_2d(np.asarray(det)))   # Convert the output to a dataframe
         return {'prob': prob, \
                 'det': det}
 
@@ -0,0 +1,83 @@
+from typing import Union
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
+
+
+class LinearProgram:
+    """
+    Minimisation linear program assembled from sparse constraint blocks and solved with HiGHS.
+
+    The decision variables are stored in a single flat vector. Each group of variables is given a block of
+    consecutive indexes by add_variables, and the constraints are built with the selection matrices returned by
+    get_variable_selection_matrix.
+    """
+    def __init__(self):
+        self.number_of_variables = 0
+        self.lower_bounds = np.empty(0)
+        self.upper_bounds = np.empty(0)
+        self.equality_constraint_coefficients = []
+        self.equality_constraint_right_hand_sides = []
+        self.inequality_constraint_coefficients = []
+        self.inequality_constraint_right_hand_sides = []
+        self.costs = None
+
+    def add_variables(self, number_of_variables: int, lower: Union[float, np.ndarray] = 0,
+                      upper: Union[float, np.ndarray] = np.inf) -> int:
+        """
+        Add a block of variables and return the index of its first variable
+        """
+        first_variable_index = self.number_of_variables
+        self.lower_bounds = np.concatenate([self.lower_bounds, np.broadcast_to(lower, (number_of_variables,))])
+        self.upper_bounds = np.concatenate([self.upper_bounds, np.broadcast_to(upper, (number_of_variables,))])
+        self.number_of_variables += number_of_variables
+        return first_variable_index
+
+    def set_variable_bounds(self, variable_indexes: np.ndarray, lower: Union[float, np.ndarray],
+                            upper: Union[float, np.ndarray]):
+        self.lower_bounds[variable_indexes] = lower
+        self.upper_bounds[variable_indexes] = upper
+
+    def get_variable_selection_matrix(self, first_variable_index: int,
+                                      number_of_selected_variables: int) -> sparse.csr_matrix:
+        """
+        Matrix whose product with the variable vector gives the selected block of consecutive variables
+        """
+        return sparse.eye(number_of_selected_variables, self.number_of_variables, k=first_variable_index,
+                          format='csr')
+
+    def add_equality_constraints(self, coefficients: sparse.spmatrix, right_hand_side: Union[float, np.ndarray]):
+        self.equality_constraint_coefficients.append(sparse.csr_matrix(coefficients))
+        self.equality_constraint_right_hand_sides.append(
+            np.broadcast_to(np.asarray(right_hand_side, dtype=float), (coefficients.shape[0],)))
+
+    def add_inequality_constraints(self, coefficients: sparse.spmatrix, right_hand_side: Union[float, np.ndarray]):
+        """
+        Add the constraints coefficients @ variables <= right_hand_side
+        """
+        self.inequality_constraint_coefficients.append(sparse.csr_matrix(coefficients))
+        self.inequality_constraint_right_hand_sides.append(
+            np.broadcast_to(np.asarray(right_hand_side, dtype=float), (coefficients.shape[0],)))
+
+    def set_objective(self, costs: np.ndarray):
+        self.costs = costs
+
+    def solve(self) -> np.ndarray:
+        equality_constraint_coefficients = None
+        equality_constraint_right_hand_sides = None
+        if self.equality_constraint_coefficients:
+            equality_constraint_coefficients = sparse.vstack(self.equality_constraint_coefficients, format='csr')
+            equality_constraint_right_hand_sides = np.concatenate(self.equality_constraint_right_hand_sides)
+        inequality_constraint_coefficients = None
+        inequality_constraint_right_hand_sides = None
+        if self.inequality_constraint_coefficients:
+            inequality_constraint_coefficients = sparse.vstack(self.inequality_constraint_coefficients, format='csr')
+            inequality_constraint_right_hand_sides = np.concatenate(self.inequality_constraint_right_hand_sides)
+        bounds = np.column_stack([self.lower_bounds, self.upper_bounds])
+
+        result = linprog(c=self.costs, A_ub=inequality_constraint_coefficients,
+                         b_ub=inequality_constraint_right_hand_sides, A_eq=equality_constraint_coefficients,
+                         b_eq=equality_constraint_right_hand_sides, bounds=bounds, method='highs')
+        if not result.success:
+            raise ValueError(f'The optimisation problem could not be solved: {result.message}')
+        return result.x
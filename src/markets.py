@@ -188,24 +188,20 @@ class SpanishMarket(Market):
 
     def get_import_costs_in_euros_per_day_and_period(self) -> np.ndarray:
         hours_per_day = 24
-        hour_array = np.ones(hours_per_day)
-        import_period_price_per_hour_list = []
-        for import_period, period_hours in self.import_periods.items():
-            import_period_price = get_specific_import_price(import_period_prices=self.import_period_prices,
-                                                            import_period=import_period)
-            period_hours_on = np.zeros_like(hour_array, dtype=int)
-            period_hours_on[period_hours] = hour_array[period_hours]
-            specific_import_period_price_per_hour = import_period_price * period_hours_on
-            import_period_price_per_hour_list.append(specific_import_period_price_per_hour)
-        import_period_price_per_hour_list = sum(import_period_price_per_hour_list)
-
-        import_period_price_per_resolution_list = []
-        market_time_intervals_hour_ratio = self.number_of_market_time_intervals_per_day / 24
-        for price in import_period_price_per_hour_list:
-            import_period_price_per_resolution = np.ones(int(market_time_intervals_hour_ratio))
-            import_period_price_per_resolution_list.append(import_period_price_per_resolution * price)
-
-        return np.hstack(import_period_price_per_resolution_list)
+        # Each hour of the day is mapped to the index of its import period. The extra last price is used by the
+        # hours that do not belong to any import period, which are not charged
+        import_period_prices_in_euros_per_kilowatt_hour = np.zeros(len(self.import_periods) + 1)
+        import_period_index_per_hour = np.full(hours_per_day, len(self.import_periods), dtype=np.uint8)
+        for import_period_index, (import_period, period_hours) in enumerate(self.import_periods.items()):
+            import_period_prices_in_euros_per_kilowatt_hour[import_period_index] = \
+                get_specific_import_price(import_period_prices=self.import_period_prices, import_period=import_period)
+            import_period_index_per_hour[period_hours] = import_period_index
+
+        market_time_intervals_hour_ratio = int(self.number_of_market_time_intervals_per_day / hours_per_day)
+        import_period_index_per_market_time_interval = np.repeat(import_period_index_per_hour,
+                                                                 market_time_intervals_hour_ratio)
+
+        return import_period_prices_in_euros_per_kilowatt_hour[import_period_index_per_market_time_interval]
 
 
 def get_market(case_data: dict,
@@ -578,13 +578,7 @@ class ThreePhaseNetwork:
         bus_df.
 
         """
-        for bus_i in range(0, len(self.bus_df)):
-            self.bus_df.at[bus_i, 'Pa'] = 0
-            self.bus_df.at[bus_i, 'Pb'] = 0
-            self.bus_df.at[bus_i, 'Pc'] = 0
-            self.bus_df.at[bus_i, 'Qa'] = 0
-            self.bus_df.at[bus_i, 'Qb'] = 0
-            self.bus_df.at[bus_i, 'Qc'] = 0
+        self.bus_df[['Pa', 'Pb', 'Pc', 'Qa', 'Qb', 'Qc']] = 0.
 
     def set_load(self, bus_id, ph_i, Pph, Qph):
         """
@@ -1,5 +1,7 @@
 from typing import List, Union
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # The plots are only saved to disk, so no interactive backend is needed
 from matplotlib import pyplot as plt
 from src.assets import BuildingAsset
 from src.hvac import get_hvac_consumed_electric_active_power_in_kilowatts
@@ -26,29 +28,7 @@ def save_plot_demand_base_and_total_imported_power(simulation_time_series_resolu
     plt.grid(True, alpha=0.5)
     plt.tight_layout()
     figure.savefig(f'{plots_path}/{current_time}_{case}_demand_base_and_total_imported_power.png')
-
-
-def save_plot_demand_base_and_total_imported_power(simulation_time_series_resolution_in_hours: float,
-                                                   number_of_time_intervals_per_day: int,
-                                                   active_power_demand_base_in_kilowatts: np.ndarray,
-                                                   market_active_power_in_kilowatts: np.ndarray, case: str,
-                                                   revenue: float, current_time: str, plots_path: str) -> None:
-    hours = simulation_time_series_resolution_in_hours * np.arange(number_of_time_intervals_per_day)
-    max_time = max(hours)
-    figure = plt.figure(num=None, figsize=(6, 3), dpi=80, facecolor='w', edgecolor='k')
-    plt.plot(hours, active_power_demand_base_in_kilowatts, '--', label='Demand')
-    plt.plot(hours, market_active_power_in_kilowatts, label='Imports')
-    plt.suptitle('Base Demand vs Imports from the Network')
-    subtitle = 'Case: ' + str(case) + ' - ' + 'Revenue[€]: ' + str(revenue)
-    plt.title(subtitle)
-    plt.ylabel('Power [kW]')
-    plt.xlabel('Time [h]')
-    plt.xlim(0, max_time)
-    plt.xticks(np.arange(0, max_time, step=1))
-    plt.legend()
-    plt.grid(True, alpha=0.5)
-    plt.tight_layout()
-    figure.savefig(f'{plots_path}/{current_time}_{case}_demand_base_and_total_imported_power.png')
+    plt.close(figure)
 
 
 def save_plot_ambient_temperature(energy_management_system_time_series_resolution_in_hours: float,
@@ -70,6 +50,7 @@ def save_plot_ambient_temperature(energy_management_system_time_series_resolutio
     plt.grid(True, alpha=0.5)
     plt.tight_layout()
     figure.savefig(f'{plots_path}/{current_time}_{case}_ambient_temperature.png')
+    plt.close(figure)
 
 
 def save_plot_building_internal_temperature(number_of_buildings: int,
@@ -103,6 +84,7 @@ def save_plot_building_internal_temperature(number_of_buildings: int,
     plt.grid(True, alpha=0.5)
     plt.tight_layout()
     figure.savefig(f'{plots_path}/{current_time}_{case}_building_internal_temperature.png')
+    plt.close(figure)
 
 
 def save_plot_hvac_consumed_active_power_in_kilowatts(number_of_buildings: int,
@@ -147,6 +129,7 @@ def save_plot_hvac_consumed_active_power_in_kilowatts(number_of_buildings: int,
     plt.grid(True, alpha=0.5)
     plt.tight_layout()
     figure.savefig(f'{plots_path}\\{current_time}_{case}_hvac_consumed_active_power_in_kilowatts.png')
+    plt.close(figure)
 
 
 def save_plot_import_periods(energy_management_system_time_series_resolution_in_hours: float,
@@ -169,6 +152,7 @@ def save_plot_import_periods(energy_management_system_time_series_resolution_in_
     plt.grid(True, alpha=0.5)
     plt.tight_layout()
     figure.savefig(f'{plots_path}\\{current_time}_{case}_import_periods.png')
+    plt.close(figure)
 
 
 def save_plot_storage_asset_used_power_in_kilowatts(energy_management_system_time_series_resolution_in_hours: float,
@@ -192,3 +176,4 @@ def save_plot_storage_asset_used_power_in_kilowatts(energy_management_system_tim
     plt.grid(True, alpha=0.5)
     plt.tight_layout()
     figure.savefig(f'{plots_path}/{current_time}_{case}_storage_asset_used_power_in_kilowatts.png')
+    plt.close(figure)
@@ -0,0 +1,36 @@
+from typing import Tuple
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+
+def run_batched_z_bus_power_flow(admittance_matrix: sparse.spmatrix, bus_power_injections: np.ndarray,
+                                 slack_bus_indexes: np.ndarray, initial_voltages: np.ndarray,
+                                 tolerance: float = 1e-8, max_iteration: int = 100) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Solve one power flow per column of bus_power_injections with the Z-bus fixed point iteration.
+
+    The admittance matrix of the PQ buses is factorised once and shared by every column, so each iteration is a
+    pair of triangular solves for all the time intervals at once. All the non slack buses are treated as constant
+    power PQ buses and the slack bus voltages are taken from initial_voltages.
+
+    Returns the complex bus voltages, with one column per time interval, and whether each column converged.
+    """
+    number_of_buses, number_of_time_intervals = bus_power_injections.shape
+    admittance_matrix = sparse.csc_matrix(admittance_matrix)
+    pq_bus_indexes = np.setdiff1d(np.arange(number_of_buses), slack_bus_indexes)
+    pq_admittance_matrix_factorisation = splu(admittance_matrix[pq_bus_indexes][:, pq_bus_indexes].tocsc())
+    slack_bus_currents = admittance_matrix[pq_bus_indexes][:, slack_bus_indexes] @ initial_voltages[slack_bus_indexes]
+
+    voltages = np.repeat(initial_voltages.astype(complex).reshape(-1, 1), number_of_time_intervals, axis=1)
+    pq_bus_power_injections = bus_power_injections[pq_bus_indexes]
+    is_converged = np.zeros(number_of_time_intervals, dtype=bool)
+    for _ in range(max_iteration):
+        bus_power_mismatches = pq_bus_power_injections - \
+            voltages[pq_bus_indexes] * np.conj((admittance_matrix @ voltages)[pq_bus_indexes])
+        is_converged = np.max(np.abs(bus_power_mismatches), axis=0, initial=0) < tolerance
+        if np.all(is_converged):
+            break
+        voltages[pq_bus_indexes] = pq_admittance_matrix_factorisation.solve(
+            np.conj(pq_bus_power_injections / voltages[pq_bus_indexes]) - slack_bus_currents.reshape(-1, 1))
+    return voltages, is_converged
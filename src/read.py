@@ -1,3 +1,4 @@
+import functools
 from typing import List
 import pandas as pd
 import os
@@ -10,9 +11,13 @@ def read_open_csv_files(csv_file_path: str) -> pd.DataFrame:
     return pd.read_csv(csv_file_path, index_col=0, parse_dates=True).values
 
 
+# The libyaml based loader is much faster, but it is only available when PyYAML was built against libyaml
+YAML_SAFE_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
 def read_case_data_from_yaml_file(cases_file_path: str, file_name: str) -> dict:
     with open(os.path.join(cases_file_path, file_name)) as file:
-        case = yaml.safe_load(file)
+        case = yaml.load(file, Loader=YAML_SAFE_LOADER)
     return case
 
 
@@ -64,6 +69,7 @@ def get_specific_import_price(import_period_prices: dict, import_period: str) ->
     return import_period_prices[import_period]
 
 
+@functools.lru_cache(maxsize=None)
 def get_building_type(file: str) -> Building:
     file_name = file.split('.')[0].lower()
     if 'hospital' in file_name:
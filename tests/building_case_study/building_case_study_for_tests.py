@@ -66,7 +66,9 @@ def get_building_case_original_results(is_winter: bool):
 
     # Electric Vehicle (EV) parameters
     seed = 1000  # Used by OPEN originally
-    random_seed = np.random.seed(seed)
+    # OPEN drew the fleet from the legacy global RandomState seeded with np.random.seed(seed), which a RandomState
+    # with the same seed reproduces
+    random_number_generator = np.random.RandomState(seed)
     number_of_electric_vehicles = 120
     max_battery_capacity_in_kilowatts_per_hour = 30
     max_battery_charging_power_in_kilowatts = 7
@@ -75,7 +77,7 @@ def get_building_case_original_results(is_winter: bool):
     electric_vehicle_departure_time_start = 5
     electric_vehicle_departure_time_end = 8
 
-    electric_vehicle_fleet = ElectricVehicleFleet(random_seed=random_seed,
+    electric_vehicle_fleet = ElectricVehicleFleet(random_seed=random_number_generator,
                                                   number_of_electric_vehicles=number_of_electric_vehicles,
                                                   max_battery_capacity_in_kilowatts_per_hour=
                                                   max_battery_capacity_in_kilowatts_per_hour,
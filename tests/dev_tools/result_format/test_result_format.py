@@ -104,6 +104,16 @@ class TestResultFormat(unittest.TestCase):
         expected_result = pd.DataFrame([first_row, second_row])
         pandas.testing.assert_frame_equal(expected_result, result)
 
+    def test_get_dataframe_from_directory_with_json_files_grouped_by_month(self) -> None:
+        path_string = 'tests/dev_tools/result_format/monthly_data'
+        results_directory = Path(path_string)
+        json_file_name = 'input_case_data.json'
+        result = get_dataframe_from_directory_with_json_files(directory=results_directory,
+                                                              json_file_name=json_file_name)
+        self.assertEqual(['20221230-122143_Commercial-275-bed Hospital.csv'], result['FolderName'].tolist())
+        self.assertEqual(['01'], result['Month'].tolist())
+        self.assertEqual([400], result['rated_photovoltaic_kilowatts'].tolist())
+
     @unittest.skip
     def test_gather_all_input_and_output_results(self) -> None:
         directory_string = 'tests/dev_tools/result_format/data'
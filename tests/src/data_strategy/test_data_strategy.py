@@ -29,6 +29,16 @@ class TestAmbientTemperature(unittest.TestCase):
         expected_result = np.array([20.05045488, 20.15392266, 19.02882983, 18.43678492, 17.87204455])
         np.testing.assert_array_almost_equal(expected_result, result)
 
+    def test_MeteoNavarraData_get_ambient_temperature_in_degree_celsius_is_cached(self):
+        file_path = 'tests/src/data_strategy/20220717_ambient_temperature_upna.csv'
+        meteo_navarra_data = MeteoNavarraData()
+        ambient_temperature_in_degree_celsius = meteo_navarra_data.get_ambient_temperature_in_degree_celsius(
+            number_of_energy_management_time_intervals_per_day=96, file_path=file_path)
+        cached_ambient_temperature_in_degree_celsius = meteo_navarra_data.get_ambient_temperature_in_degree_celsius(
+            number_of_energy_management_time_intervals_per_day=96, file_path=file_path)
+        self.assertIs(ambient_temperature_in_degree_celsius, cached_ambient_temperature_in_degree_celsius)
+        self.assertFalse(ambient_temperature_in_degree_celsius.flags.writeable)
+
     def test_get_ambient_temperature_in_degree_celsius_by_data_strategy_UK(self):
         file_path = 'tests/src/data_strategy'
         yaml_file = 'uk_summer_no_flexibility.yaml'
@@ -138,6 +138,16 @@ class TestMarkets(unittest.TestCase):
         expected_result = np.array([1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 3])
         np.testing.assert_equal(expected_result, result)
 
+    def test_calculate_revenue_spanish(self):
+        yaml_file = 'spanish_market.yaml'
+        file_path = 'tests/src/markets'
+        market = create_spanish_market(yaml_file=yaml_file, file_path=file_path)
+        total_import_in_kilowatts = np.ones(24)
+        result = market.calculate_revenue(total_import_in_kilowatts=total_import_in_kilowatts,
+                                          simulation_time_interval_in_minutes=1)
+        expected_result = -(12 * 1 + 11 * 2 + 1 * 3) - 0.5
+        self.assertAlmostEqual(expected_result, result)
+
     def test_get_market_incorrect(self):
         yaml_file = 'incorrect_market.yaml'
         file_path = 'tests/src/markets'
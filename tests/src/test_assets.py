@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+from src.assets import StorageAsset
+
+
+def _create_a_test_storage_asset() -> StorageAsset:
+    number_of_time_intervals_per_day = 24
+    return StorageAsset(max_energy_in_kilowatt_hour=10 * np.ones(number_of_time_intervals_per_day),
+                        min_energy_in_kilowatt_hour=np.zeros(number_of_time_intervals_per_day),
+                        max_active_power_in_kilowatts=4 * np.ones(number_of_time_intervals_per_day),
+                        min_active_power_in_kilowatts=-4 * np.ones(number_of_time_intervals_per_day),
+                        initial_energy_level_in_kilowatt_hour=0,
+                        required_terminal_energy_level_in_kilowatt_hour=10,
+                        bus_id=1,
+                        simulation_time_series_hour_resolution=1,
+                        number_of_time_intervals_per_day=number_of_time_intervals_per_day,
+                        energy_management_system_time_series_resolution_in_seconds=1,
+                        number_of_energy_management_system_time_intervals_per_day=number_of_time_intervals_per_day)
+
+
+class TestStorageAsset(unittest.TestCase):
+
+    def test_update_control_stops_charging_at_max_energy(self):
+        storage_asset = _create_a_test_storage_asset()
+        storage_asset.update_control(4 * np.ones(24))
+
+        expected_active_power_in_kilowatts = np.zeros(24)
+        expected_active_power_in_kilowatts[:3] = 4
+        np.testing.assert_array_equal(expected_active_power_in_kilowatts, storage_asset.active_power_in_kilowatts)
+        self.assertEqual(10, storage_asset.energy_level_in_kilowatt_hour[-1])
+
+    def test_update_control_above_the_absolute_active_power_reads_the_last_charging_efficiency(self):
+        storage_asset = _create_a_test_storage_asset()
+        storage_asset.absolute_active_power_in_kilowatts = 2
+        storage_asset.charging_efficiency[-1] = 0.5
+        storage_asset.update_control(np.concatenate([[4.], np.zeros(23)]))
+
+        self.assertEqual(2, storage_asset.energy_level_in_kilowatt_hour[1])
+
+    def test_update_control_t_matches_update_control(self):
+        active_power_in_kilowatts = np.array([4., -2., 4., 4., 4., -4., -4., -4., -4., 0.] + [1.] * 14)
+        storage_asset = _create_a_test_storage_asset()
+        storage_asset.update_control(active_power_in_kilowatts.copy())
+        storage_asset_updated_per_time_interval = _create_a_test_storage_asset()
+        for t in range(24):
+            storage_asset_updated_per_time_interval.update_control_t(active_power_in_kilowatts[t], t)
+
+        np.testing.assert_array_equal(storage_asset.active_power_in_kilowatts,
+                                      storage_asset_updated_per_time_interval.active_power_in_kilowatts)
+        np.testing.assert_array_equal(storage_asset.energy_level_in_kilowatt_hour,
+                                      storage_asset_updated_per_time_interval.energy_level_in_kilowatt_hour)
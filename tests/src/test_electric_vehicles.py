@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+from src.electric_vehicles import ElectricVehicleFleet
+
+
+def _create_a_test_electric_vehicle_fleet(random_seed) -> ElectricVehicleFleet:
+    return ElectricVehicleFleet(random_seed=random_seed,
+                                number_of_electric_vehicles=10,
+                                max_battery_capacity_in_kilowatts_per_hour=30,
+                                max_electric_vehicle_charging_power=7,
+                                electric_vehicle_arrival_time_start=12,
+                                electric_vehicle_arrival_time_end=22,
+                                electric_vehicle_departure_time_start=5,
+                                electric_vehicle_departure_time_end=8)
+
+
+class TestElectricVehicleFleet(unittest.TestCase):
+
+    def test_same_seed_gives_same_fleet(self):
+        seed = 1000
+        fleet_1 = _create_a_test_electric_vehicle_fleet(random_seed=seed)
+        fleet_2 = _create_a_test_electric_vehicle_fleet(random_seed=np.random.default_rng(seed))
+
+        np.testing.assert_array_equal(fleet_1.random_electric_vehicle_arrival_time,
+                                      fleet_2.random_electric_vehicle_arrival_time)
+        np.testing.assert_array_equal(fleet_1.random_electric_vehicle_departure_time,
+                                      fleet_2.random_electric_vehicle_departure_time)
+        np.testing.assert_array_equal(fleet_1.random_electric_vehicle_energy_levels,
+                                      fleet_2.random_electric_vehicle_energy_levels)
+
+    def test_legacy_random_state_reproduces_the_global_seed_draws(self):
+        seed = 1000
+        fleet = _create_a_test_electric_vehicle_fleet(random_seed=np.random.RandomState(seed))
+        np.random.seed(seed)
+        expected_arrival_time = np.random.randint(12, 22, 10)
+        expected_departure_time = np.random.randint(5, 8, 10)
+        expected_energy_levels = 30 * np.random.uniform(0, 1, 10)
+
+        np.testing.assert_array_equal(expected_arrival_time, fleet.random_electric_vehicle_arrival_time)
+        np.testing.assert_array_equal(expected_departure_time, fleet.random_electric_vehicle_departure_time)
+        np.testing.assert_array_equal(expected_energy_levels, fleet.random_electric_vehicle_energy_levels)
+
+    def test_random_electric_vehicle_arrival_time_range(self):
+        fleet = _create_a_test_electric_vehicle_fleet(random_seed=1000)
+        self.assertTrue(np.all(fleet.random_electric_vehicle_arrival_time >= 12))
+        self.assertTrue(np.all(fleet.random_electric_vehicle_arrival_time < 22))
+
+    def test_check_electric_vehicle_fleet_charging_feasibility(self):
+        fleet = _create_a_test_electric_vehicle_fleet(random_seed=1000)
+        fleet.check_electric_vehicle_fleet_charging_feasibility()
+        self.assertTrue(np.all(fleet.random_electric_vehicle_departure_time >=
+                               fleet.random_electric_vehicle_arrival_time))
+        self.assertTrue(fleet.is_electric_vehicle_fleet_feasible_for_the_system)
@@ -1,8 +1,10 @@
+import copy
 import unittest
 import numpy as np
+import pandapower as pp
 from typing import List
 from src.assets import NonDispatchableAsset, StorageAsset, BuildingAsset
-from src.energy_system import EnergySystem, get_temperature_constraint_for_no_initial_time
+from src.energy_system import EnergySystem
 from src.markets import Market, OPENMarket
 from src.network_3_phase_pf import ThreePhaseNetwork
 
@@ -148,6 +150,89 @@ def _create_a_test_energy_system(non_dispatchable_asset: List[NonDispatchableAss
     return energy_system
 
 
+def _create_a_test_pandapower_network(is_last_bus_in_service: bool) -> pp.pandapowerNet:
+    network = pp.create_empty_network()
+    pp.create_buses(network, nr_buses=4, vn_kv=[20, 0.4, 0.4, 0.4])
+    pp.create_ext_grid(network, bus=0, vm_pu=1.0)
+    pp.create_transformer(network, hv_bus=0, lv_bus=1, std_type="0.25 MVA 20/0.4 kV")
+    pp.create_line(network, from_bus=1, to_bus=2, length_km=0.1, std_type="NAYY 4x50 SE")
+    pp.create_line(network, from_bus=2, to_bus=3, length_km=0.1, std_type="NAYY 4x50 SE")
+    network.bus.loc[3, 'in_service'] = is_last_bus_in_service
+    return network
+
+
+def _create_a_test_pandapower_energy_system(network: pp.pandapowerNet) -> EnergySystem:
+    simulation_time_series_resolution_in_hours = 1
+    number_of_time_intervals_per_day = 24
+    non_dispatchable_asset = NonDispatchableAsset(
+        simulation_time_series_hour_resolution=simulation_time_series_resolution_in_hours, bus_id=2,
+        active_power_in_kilowatts=10 + 5 * np.sin(np.arange(number_of_time_intervals_per_day) / 3),
+        reactive_power_in_kilovolt_ampere_reactive=np.full(number_of_time_intervals_per_day, 2.))
+    building_asset = BuildingAsset(max_inside_degree_celsius=22,
+                                   min_inside_degree_celsius=15,
+                                   max_consumed_electric_heating_kilowatts=50,
+                                   max_consumed_electric_cooling_kilowatts=50,
+                                   initial_inside_degree_celsius=17,
+                                   building_thermal_capacitance_in_kilowatts_hour_per_degree_celsius=5.5,
+                                   building_thermal_resistance_in_degree_celsius_per_kilowatts=4.5,
+                                   heat_pump_coefficient_of_performance=3,
+                                   chiller_coefficient_of_performance=2,
+                                   ambient_temperature_in_degree_celsius=25,
+                                   bus_id=3,
+                                   simulation_time_series_hour_resolution=simulation_time_series_resolution_in_hours,
+                                   energy_management_system_time_series_resolution_in_hours=
+                                   simulation_time_series_resolution_in_hours)
+    market = OPENMarket(network_bus_id=0,
+                        market_time_series_resolution_in_hours=simulation_time_series_resolution_in_hours,
+                        export_prices_in_euros_per_kilowatt_hour=0.05,
+                        import_periods=[{'peak': [20, 0.2]}, {'valley': [4, 0.1]}],
+                        max_demand_charge_in_euros_per_kilowatt_hour=1,
+                        max_import_kilowatts=500,
+                        max_export_kilowatts=500,
+                        offered_kilowatt_in_frequency_response=0,
+                        max_frequency_response_state_of_charge=1,
+                        min_frequency_response_state_of_charge=0,
+                        frequency_response_price_in_euros_per_kilowatt_hour=0)
+    return EnergySystem(storage_assets=[],
+                        non_dispatchable_assets=[non_dispatchable_asset],
+                        network=network,
+                        market=market,
+                        simulation_time_series_resolution_in_hours=simulation_time_series_resolution_in_hours,
+                        energy_management_system_time_series_resolution_in_hours=
+                        simulation_time_series_resolution_in_hours,
+                        building_assets=[building_asset],
+                        blackout_start_time_in_hours=12,
+                        blackout_stop_time_in_hours=11)
+
+
+def _get_newton_raphson_power_flow_results(energy_system: EnergySystem) -> dict:
+    # one independent pandapower power flow per simulation interval, with the asset powers set by simulate_network
+    network = copy.deepcopy(energy_system.network)
+    number_of_buses = len(network.bus)
+    active_power_bus_demand_in_kilowatts = np.zeros([energy_system.number_of_time_intervals_per_day, number_of_buses])
+    reactive_power_bus_demand_in_kilovolt_ampere_reactive = np.zeros_like(active_power_bus_demand_in_kilowatts)
+    for asset in energy_system.building_assets + energy_system.non_dispatchable_assets:
+        active_power_bus_demand_in_kilowatts[:, asset.bus_id] += asset.active_power_in_kilowatts
+        reactive_power_bus_demand_in_kilovolt_ampere_reactive[:, asset.bus_id] += asset.reactive_power
+    load_indexes = pp.create_loads(network, buses=np.arange(number_of_buses), p_mw=0, q_mvar=0)
+    results = {'buses_voltage_in_per_unit': [], 'buses_voltage_angle_in_degrees': [],
+               'buses_active_power_in_kilowatts': [], 'buses_reactive_power_in_kilovolt_ampere_reactive': [],
+               'market_active_power_in_kilowatts': [], 'market_reactive_power_in_kilovolt_ampere_reactive': []}
+    for active_power_in_kilowatts, reactive_power_in_kilovolt_ampere_reactive in zip(
+            active_power_bus_demand_in_kilowatts, reactive_power_bus_demand_in_kilovolt_ampere_reactive):
+        network.load.loc[load_indexes, 'p_mw'] = active_power_in_kilowatts / 1e3
+        network.load.loc[load_indexes, 'q_mvar'] = reactive_power_in_kilovolt_ampere_reactive / 1e3
+        pp.runpp(network)
+        results['buses_voltage_in_per_unit'].append(network.res_bus['vm_pu'].to_numpy())
+        results['buses_voltage_angle_in_degrees'].append(network.res_bus['va_degree'].to_numpy())
+        results['buses_active_power_in_kilowatts'].append(network.res_bus['p_mw'].to_numpy() * 1e3)
+        results['buses_reactive_power_in_kilovolt_ampere_reactive'].append(network.res_bus['q_mvar'].to_numpy() * 1e3)
+        results['market_active_power_in_kilowatts'].append(network.res_ext_grid['p_mw'].iloc[0] * 1e3)
+        results['market_reactive_power_in_kilovolt_ampere_reactive'].append(
+            network.res_ext_grid['q_mvar'].iloc[0] * 1e3)
+    return {name: np.array(result) for name, result in results.items()}
+
+
 class TestEnergySystem(unittest.TestCase):
 
     def test_get_non_dispatchable_assets_active_power_in_kilowatts(self):
@@ -169,26 +254,32 @@ class TestEnergySystem(unittest.TestCase):
         result = energy_system._get_non_dispatchable_assets_active_power_in_kilowatts()
         np.testing.assert_equal(expected_result, result)
 
-    def test_get_temperature_constraint_for_no_initial_time(self):
-        alpha = 0.1
-        beta = 0.1
-        gamma = 0.1
-        previous_building_internal_temperature_in_celsius_degrees = 17.5
-        chiller_coefficient_of_performance = 3
-        previous_cooling_active_power_in_kilowatts = 500
-        heat_pump_coefficient_of_performance = 3.5
-        previous_heating_active_power_in_kilowatts = 500
-        previous_ambient_temperature_in_degree_celsius = 18
-
-        result = \
-            get_temperature_constraint_for_no_initial_time(
-                alpha=alpha, beta=beta, gamma=gamma, previous_building_internal_temperature_in_celsius_degrees=
-                previous_building_internal_temperature_in_celsius_degrees,
-                chiller_coefficient_of_performance=chiller_coefficient_of_performance,
-                previous_cooling_active_power_in_kilowatts=previous_cooling_active_power_in_kilowatts,
-                heat_pump_coefficient_of_performance=heat_pump_coefficient_of_performance,
-                previous_heating_active_power_in_kilowatts=previous_heating_active_power_in_kilowatts,
-                previous_ambient_temperature_in_degree_celsius=previous_ambient_temperature_in_degree_celsius)
-
-        expected_result = 28.55
-        self.assertEqual(expected_result, result)
+    def test_simulate_network(self):
+        energy_system = _create_a_test_pandapower_energy_system(
+            network=_create_a_test_pandapower_network(is_last_bus_in_service=True))
+        output = energy_system.simulate_network()
+
+        expected_results = _get_newton_raphson_power_flow_results(energy_system=energy_system)
+        for name, expected_result in expected_results.items():
+            np.testing.assert_allclose(output[name], expected_result, atol=1e-4, err_msg=name)
+
+    def test_energy_management_system_resolution_not_multiple_of_simulation_resolution(self):
+        with self.assertRaises(ValueError):
+            EnergySystem(storage_assets=[],
+                         non_dispatchable_assets=[],
+                         network=None,
+                         market=None,
+                         simulation_time_series_resolution_in_hours=0.25,
+                         energy_management_system_time_series_resolution_in_hours=0.4,
+                         building_assets=[],
+                         blackout_start_time_in_hours=11,
+                         blackout_stop_time_in_hours=11)
+
+    def test_simulate_network_with_an_out_of_service_bus(self):
+        energy_system = _create_a_test_pandapower_energy_system(
+            network=_create_a_test_pandapower_network(is_last_bus_in_service=False))
+        output = energy_system.simulate_network()
+
+        expected_results = _get_newton_raphson_power_flow_results(energy_system=energy_system)
+        for name, expected_result in expected_results.items():
+            np.testing.assert_allclose(output[name], expected_result, atol=1e-4, err_msg=name)
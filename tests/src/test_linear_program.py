@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+from src.linear_program import LinearProgram
+
+
+def _create_a_test_linear_program() -> LinearProgram:
+    problem = LinearProgram()
+    first_variable_index = problem.add_variables(number_of_variables=2, lower=0, upper=np.array([2, 5]))
+    problem.add_equality_constraints(
+        coefficients=problem.get_variable_selection_matrix(first_variable_index=first_variable_index,
+                                                           number_of_selected_variables=1) +
+        problem.get_variable_selection_matrix(first_variable_index=first_variable_index + 1,
+                                              number_of_selected_variables=1),
+        right_hand_side=3)
+    problem.set_objective(costs=np.array([1, 2]))
+    return problem
+
+
+class TestLinearProgram(unittest.TestCase):
+
+    def test_add_variables(self):
+        problem = LinearProgram()
+        first_block_index = problem.add_variables(number_of_variables=3)
+        second_block_index = problem.add_variables(number_of_variables=2, lower=-1, upper=1)
+        self.assertEqual(0, first_block_index)
+        self.assertEqual(3, second_block_index)
+        np.testing.assert_equal(np.array([0, 0, 0, -1, -1]), problem.lower_bounds)
+        np.testing.assert_equal(np.array([np.inf, np.inf, np.inf, 1, 1]), problem.upper_bounds)
+
+    def test_get_variable_selection_matrix(self):
+        problem = LinearProgram()
+        problem.add_variables(number_of_variables=4)
+        result = problem.get_variable_selection_matrix(first_variable_index=1,
+                                                       number_of_selected_variables=2).toarray()
+        expected_result = np.array([[0, 1, 0, 0],
+                                    [0, 0, 1, 0]])
+        np.testing.assert_equal(expected_result, result)
+
+    def test_solve(self):
+        problem = _create_a_test_linear_program()
+        result = problem.solve()
+        expected_result = np.array([2, 1])
+        np.testing.assert_almost_equal(expected_result, result)
+
+    def test_solve_with_inequality_constraints(self):
+        problem = _create_a_test_linear_program()
+        problem.add_inequality_constraints(
+            coefficients=problem.get_variable_selection_matrix(first_variable_index=0,
+                                                               number_of_selected_variables=1),
+            right_hand_side=1)
+        result = problem.solve()
+        expected_result = np.array([1, 2])
+        np.testing.assert_almost_equal(expected_result, result)
+
+    def test_solve_infeasible(self):
+        problem = _create_a_test_linear_program()
+        problem.set_variable_bounds(variable_indexes=np.array([0, 1]), lower=0, upper=1)
+        with self.assertRaises(ValueError):
+            problem.solve()
@@ -0,0 +1,40 @@
+import unittest
+import numpy as np
+import pandapower as pp
+from src.power_flow import run_batched_z_bus_power_flow
+
+
+def _create_a_test_network() -> pp.pandapowerNet:
+    network = pp.create_empty_network()
+    pp.create_buses(network, nr_buses=3, vn_kv=[20, 0.4, 0.4])
+    pp.create_ext_grid(network, bus=0, vm_pu=1.0)
+    pp.create_transformer(network, hv_bus=0, lv_bus=1, std_type="0.25 MVA 20/0.4 kV")
+    pp.create_line(network, from_bus=1, to_bus=2, length_km=0.1, std_type="NAYY 4x50 SE")
+    return network
+
+
+class TestPowerFlow(unittest.TestCase):
+
+    def test_run_batched_z_bus_power_flow(self):
+        network = _create_a_test_network()
+        active_power_loads_in_mega_watts = np.array([[0.01, 0.05], [0.02, 0.03], [0.0, 0.08]])
+        reactive_power_loads_in_mega_volt_ampere_reactive = np.array([[0.0, 0.01], [0.005, 0.0], [0.01, 0.02]])
+        expected_voltages = []
+        load_indexes = pp.create_loads(network, buses=[1, 2], p_mw=0, q_mvar=0)
+        for active_power, reactive_power in zip(active_power_loads_in_mega_watts,
+                                                reactive_power_loads_in_mega_volt_ampere_reactive):
+            network.load.loc[load_indexes, 'p_mw'] = active_power
+            network.load.loc[load_indexes, 'q_mvar'] = reactive_power
+            pp.runpp(network)
+            expected_voltages.append(network._ppc['internal']['V'].copy())
+        power_flow_model = network._ppc['internal']
+        bus_power_injections = np.zeros([3, 3], dtype=complex)
+        bus_power_injections[1:] = -(active_power_loads_in_mega_watts +
+                                     1j * reactive_power_loads_in_mega_volt_ampere_reactive).T
+        voltages, is_converged = run_batched_z_bus_power_flow(
+            admittance_matrix=power_flow_model['Ybus'],
+            bus_power_injections=bus_power_injections / power_flow_model['baseMVA'],
+            slack_bus_indexes=power_flow_model['ref'], initial_voltages=power_flow_model['V'])
+
+        self.assertTrue(np.all(is_converged))
+        np.testing.assert_allclose(voltages, np.array(expected_voltages).T, atol=1e-7)